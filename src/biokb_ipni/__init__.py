@@ -1,20 +1,29 @@
+import importlib
 import logging
 from importlib.metadata import PackageNotFoundError, version
+from typing import Any
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
-from biokb_ipni.db import models
-from biokb_ipni.db.manager import DbManager, get_session, import_data
-from biokb_ipni.rdf.neo4j_importer import Neo4jImporter, import_ttls
-from biokb_ipni.rdf.turtle import TurtleCreator, create_ttls
-
 try:
     __version__ = version("biokb_ipni")
 except PackageNotFoundError:
     # Package is not installed (e.g., during local development)
     __version__ = "unknown"
 
+# The public API is imported on first access, so importing the package (e.g. for
+# the CLI or its version) does not load pandas, SQLAlchemy and rdflib.
+_LAZY_IMPORTS = {
+    "DbManager": "biokb_ipni.db.manager",
+    "import_data": "biokb_ipni.db.manager",
+    "get_session": "biokb_ipni.db.manager",
+    "Neo4jImporter": "biokb_ipni.rdf.neo4j_importer",
+    "import_ttls": "biokb_ipni.rdf.neo4j_importer",
+    "TurtleCreator": "biokb_ipni.rdf.turtle",
+    "create_ttls": "biokb_ipni.rdf.turtle",
+}
+
 __all__ = [
     "DbManager",
     "import_data",
@@ -25,3 +34,17 @@ __all__ = [
     "create_ttls",
     "models",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "models":
+        return importlib.import_module("biokb_ipni.db.models")
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
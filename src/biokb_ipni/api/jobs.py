@@ -0,0 +1,127 @@
+"""Long running database management tasks, which run after their response was sent.
+
+The job states are stored as JSON files in `JOBS_FOLDER`, so all worker processes
+of the API share them. A job holds a lock file named after the job until it is
+done; the operating system releases the lock if the worker dies, so a job of the
+same name can be started again.
+"""
+
+import logging
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Generator, Optional
+
+from fastapi import BackgroundTasks
+
+from biokb_ipni.api import schemas
+from biokb_ipni.constants import JOBS_FOLDER
+
+logger = logging.getLogger(__name__)
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock(file: IO[str], blocking: bool) -> bool:
+        try:
+            msvcrt.locking(
+                file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1
+            )
+        except OSError:
+            return False
+        return True
+
+else:
+    import fcntl
+
+    def _lock(file: IO[str], blocking: bool) -> bool:
+        try:
+            fcntl.flock(
+                file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            )
+        except OSError:
+            return False
+        return True
+
+
+def _path(file_name: str) -> str:
+    return os.path.join(JOBS_FOLDER, file_name)
+
+
+def _save(job: schemas.Job) -> None:
+    # written to a temporary file first, so readers never see a partial file
+    path = _path(f"{job.id}.json")
+    with open(path + ".tmp", "w") as f:
+        f.write(job.model_dump_json())
+    os.replace(path + ".tmp", path)
+
+
+def get_job(job_id: str) -> Optional[schemas.Job]:
+    """Get a job started by any worker process, None if it does not exist."""
+    try:
+        # only job IDs may become part of a file path
+        path = _path(f"{uuid.UUID(job_id)}.json")
+        with open(path) as f:
+            return schemas.Job.model_validate_json(f.read())
+    except (ValueError, FileNotFoundError):
+        return None
+
+
+@contextmanager
+def _start_lock() -> Generator[None, None, None]:
+    """Serialize starting jobs, so `{name}.current` is up to date when read."""
+    with open(_path("start.lock"), "a") as f:
+        _lock(f, blocking=True)
+        yield
+
+
+def _run_job(job: schemas.Job, task: Callable[[], Any], lock_file: IO[str]) -> None:
+    try:
+        job.status = "running"
+        _save(job)
+        try:
+            job.result = task()
+            job.status = "finished"
+        except Exception as e:
+            logger.error(f"Error in job {job.name} ({job.id}): {e}")
+            job.error = str(e)
+            job.status = "failed"
+        _save(job)
+    finally:
+        # releases the lock, a job with the same name can be started again
+        lock_file.close()
+
+
+def start_job(
+    background_tasks: BackgroundTasks, name: str, task: Callable[[], Any]
+) -> schemas.Job:
+    """Run `task` as background job, unless a job with this name is in progress.
+
+    Returns:
+        schemas.Job: the new job or the one already in progress
+    """
+    os.makedirs(JOBS_FOLDER, exist_ok=True)
+    with _start_lock():
+        current_path = _path(f"{name}.current")
+        current = None
+        if os.path.exists(current_path):
+            with open(current_path) as f:
+                current = get_job(f.read())
+        lock_file = open(_path(f"{name}.lock"), "a")
+        if not _lock(lock_file, blocking=False):
+            lock_file.close()
+            if current:
+                return current
+            raise RuntimeError(f"Job {name} is locked, but was not found.")
+        if current and current.status in ("pending", "running"):
+            # the lock was released without the job being done
+            current.status = "failed"
+            current.error = "Interrupted, the worker process stopped."
+            _save(current)
+        job = schemas.Job(id=str(uuid.uuid4()), name=name)
+        _save(job)
+        with open(current_path, "w") as f:
+            f.write(job.id)
+    background_tasks.add_task(_run_job, job, task, lock_file)
+    return job
@@ -1,26 +1,78 @@
+import functools
+import gzip
+import hashlib
+import importlib.util
 import logging
 import os
-import re
 import secrets
+import threading
+import time
 from contextlib import asynccontextmanager
-from difflib import SequenceMatcher
-from typing import AsyncGenerator, Generator, List
+from typing import (
+    Annotated,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
 import jellyfish
-import Levenshtein
+import numpy as np
 import uvicorn
-from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request, status
+from anyio import to_thread
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+from fastapi import (
+    BackgroundTasks,
+    Body,
+    Depends,
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from sqlalchemy import Engine, create_engine, func, or_, select
-from sqlalchemy.orm import Session, aliased, sessionmaker
+from pydantic import BaseModel, TypeAdapter
+from rapidfuzz import process
+from rapidfuzz.distance import Indel, JaroWinkler
+from sqlalchemy import (
+    Engine,
+    Executable,
+    Float,
+    and_,
+    create_engine,
+    false,
+    func,
+    lambda_stmt,
+    literal_column,
+    make_url,
+    or_,
+    select,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import (
+    Session,
+    aliased,
+    joinedload,
+    raiseload,
+    selectinload,
+    sessionmaker,
+)
 
 # from database import SessionLocal
 from sqlalchemy.sql import text
 
-from biokb_ipni.api import schemas
-from biokb_ipni.api.query_tools import SASearchResults, build_dynamic_query
+from biokb_ipni.api import jobs, schemas
+from biokb_ipni.api.query_tools import build_dynamic_query
+from biokb_ipni.api.schemas import SimilarityMethod
 from biokb_ipni.api.tags import Tag
 from biokb_ipni.constants import (
     DB_DEFAULT_CONNECTION_STR,
@@ -42,33 +94,260 @@ logger = logging.getLogger(__name__)
 USERNAME = os.environ.get("IPNI_API_USERNAME", "admin")
 PASSWORD = os.environ.get("IPNI_API_PASSWORD", "admin")
 
+# sync endpoints run in the anyio worker threads, each holding one connection
+THREADPOOL_SIZE = 40
+
+T = TypeVar("T")
+
 
 def get_engine() -> Engine:
     conn_url = os.environ.get("CONNECTION_STR", DB_DEFAULT_CONNECTION_STR)
-    engine: Engine = create_engine(conn_url)
+    pool_options: dict[str, Any] = {"pool_pre_ping": True}
+    backend = make_url(conn_url).get_backend_name()
+    if backend != "sqlite":
+        # the pool must not be the bottleneck when acquiring connections
+        pool_options.update(
+            pool_size=THREADPOOL_SIZE // 2,
+            max_overflow=THREADPOOL_SIZE - THREADPOOL_SIZE // 2,
+            pool_recycle=1800,
+        )
+    if backend == "postgresql":
+        # the pg_trgm `%` operator in names_find_similar filters on this setting;
+        # sent with the connection startup, so it costs no extra round trip
+        pool_options["connect_args"] = {
+            "options": "-c pg_trgm.similarity_threshold=0.3"
+        }
+    engine: Engine = create_engine(conn_url, **pool_options)
     return engine
 
 
 def create_session_factory(engine: Engine) -> sessionmaker[Session]:
-    return sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
+    return sessionmaker(
+        bind=engine, class_=Session, autoflush=False, expire_on_commit=False
+    )
 
 
 def get_session(request: Request) -> Generator[Session, None, None]:
+    """Yield a session of the factory created once on startup.
+
+    FastAPI caches the dependency per request, so all dependencies of a request
+    share this session. It connects only on first use, so requests answered
+    from the caches never check out a connection.
+    """
     session_factory: sessionmaker[Session] = request.app.state.session_factory
-    session = session_factory()
-    try:
+    with session_factory() as session:
         yield session
-    finally:
-        session.close()
+
+
+# The caches below hold data of the last import. Every import writes a new
+# generation to the database, so workers which did not run the import themselves
+# notice it on their next check and drop their caches as well.
+_IMPORT_CHECK_INTERVAL = 10  # seconds
+_import_generation: Optional[str] = None
+_import_checked_at = float("-inf")
+_import_check_lock = threading.Lock()
+
+
+def _clear_caches_if_reimported(session: Session, force: bool = False) -> None:
+    """Drop all caches if the data was imported again since the last check.
+
+    The database is asked at most every `_IMPORT_CHECK_INTERVAL` seconds, unless
+    `force` is set.
+    """
+    global _import_generation, _import_checked_at
+    if not force and time.monotonic() - _import_checked_at < _IMPORT_CHECK_INTERVAL:
+        return
+    with _import_check_lock:
+        now = time.monotonic()
+        if not force and now - _import_checked_at < _IMPORT_CHECK_INTERVAL:
+            return
+        _import_checked_at = now
+        stmt = select(models.ImportInfo.generation).order_by(
+            models.ImportInfo.id.desc()
+        )
+        try:
+            generation = session.scalars(stmt.limit(1)).first()
+        except SQLAlchemyError:
+            # databases imported by older versions have no import_info table
+            session.rollback()
+            generation = None
+        if generation != _import_generation:
+            _clear_lookup_cache()
+            _import_generation = generation
+
+
+# Distinct values of categorical columns and the family list only change with a
+# new import, so they are cached for a few minutes (and dropped after a new
+# import) instead of scanning the whole table per request.
+_lookup_cache: TTLCache[str, Any] = TTLCache(maxsize=16, ttl=300)
+_lookup_cache_lock = threading.Lock()
+
+
+def _cached_lookup(lookup: Callable[[Session], T]) -> Callable[[Session], T]:
+    """Cache the result of a lookup query by the name of the decorated function."""
+    cached_lookup = cached(
+        _lookup_cache, key=lambda session: lookup.__name__, lock=_lookup_cache_lock
+    )(lookup)
+
+    @functools.wraps(lookup)
+    def wrapper(session: Session) -> T:
+        _clear_caches_if_reimported(session)
+        return cached_lookup(session)
+
+    return wrapper
+
+
+# the lookups are cached serialized, so responses need no encoding at all
+_NAME_RANK_COUNTS_ADAPTER = TypeAdapter(list[schemas.NameRankCount])
+_NAME_STATUS_COUNTS_ADAPTER = TypeAdapter(list[schemas.NameStatusCount])
+_STRING_LIST_ADAPTER = TypeAdapter(list[str])
+
+
+@_cached_lookup
+def _name_rank_counts_json(session: Session) -> bytes:
+    count = func.count().label("count")
+    stmt = (
+        select(models.Name.rank, count)
+        .where(models.Name.rank.is_not(None))
+        .group_by(models.Name.rank)
+        .order_by(count.desc())
+    )
+    return _NAME_RANK_COUNTS_ADAPTER.dump_json(
+        [schemas.NameRankCount(rank=rank, count=n) for rank, n in session.execute(stmt)]
+    )
+
+
+@_cached_lookup
+def _name_status_counts_json(session: Session) -> bytes:
+    count = func.count().label("count")
+    stmt = (
+        select(models.Name.status, count)
+        .where(models.Name.status.is_not(None))
+        .group_by(models.Name.status)
+        .order_by(count.desc())
+    )
+    return _NAME_STATUS_COUNTS_ADAPTER.dump_json(
+        [
+            schemas.NameStatusCount(status=status, count=n)
+            for status, n in session.execute(stmt)
+        ]
+    )
+
+
+@_cached_lookup
+def _name_relation_types_json(session: Session) -> bytes:
+    stmt = (
+        select(models.NameRelation.type)
+        .where(models.NameRelation.type.is_not(None))
+        .distinct()
+        .order_by(models.NameRelation.type)
+    )
+    return _STRING_LIST_ADAPTER.dump_json(list(session.scalars(stmt).all()))
+
+
+_FAMILY_LIST_ADAPTER = TypeAdapter(List[schemas.FamilyWithId])
+
+
+@_cached_lookup
+def _family_list_json(session: Session) -> tuple[bytes, bytes, str]:
+    """Return all families serialized as JSON, gzip compressed JSON and ETag."""
+    # plain rows of the three columns, without hydrating ORM objects
+    stmt = select(
+        models.Family.id, models.Family.family, models.Family.tax_id
+    ).order_by(models.Family.family)
+    families = session.execute(stmt).all()
+    # validate and serialize the whole list in one pydantic-core pass; reading
+    # the Row attributes directly is faster than a JSON round trip
+    # (`validate_json` of the dumped row dicts takes almost twice as long)
+    content = _FAMILY_LIST_ADAPTER.dump_json(
+        _FAMILY_LIST_ADAPTER.validate_python(families, from_attributes=True)
+    )
+    # compressed once here instead of per response
+    compressed = gzip.compress(content, compresslevel=9, mtime=0)
+    return content, compressed, f'"{hashlib.md5(content).hexdigest()}"'
+
+
+# Entries requested by ID are cached as validated response models, so repeated
+# requests for popular IDs neither hit the database nor validate again. Every
+# worker process holds its own cache, so it is bounded to a few thousand entries.
+_by_id_cache: TTLCache[Any, Any] = TTLCache(maxsize=4096, ttl=3600)
+_by_id_cache_lock = threading.Lock()
+
+
+def _cached_by_id(endpoint: Callable[..., T]) -> Callable[..., T]:
+    """Cache the response of a by-ID endpoint by its name and query parameters.
+
+    Not found errors are raised as exception and therefore not cached.
+    """
+    cached_endpoint = cached(
+        _by_id_cache,
+        key=lambda session, **params: hashkey(endpoint.__name__, *params.values()),
+        lock=_by_id_cache_lock,
+    )(endpoint)
+
+    # FastAPI reads the parameters of `endpoint` from `__wrapped__`
+    @functools.wraps(endpoint)
+    def wrapper(session: Session, **params: Any) -> T:
+        _clear_caches_if_reimported(session)
+        return cached_endpoint(session=session, **params)
+
+    return wrapper
+
+
+def _search_response(result_schema: type[BaseModel], result: Any) -> Response:
+    """Validate and serialize a search result in one pass in the endpoint's thread.
+
+    A returned dict would be validated against the response_model by FastAPI in
+    a second trip to the threadpool before being serialized.
+    """
+    content = result_schema.model_validate(
+        result, from_attributes=True
+    ).model_dump_json()
+    return Response(content=content, media_type="application/json")
+
+
+def _get_or_404(
+    session: Session,
+    model: type[T],
+    pk: Any,
+    label: str,
+    options: Sequence[Any] = (raiseload("*"),),
+) -> T:
+    """Get an entry by its primary key with loader `options` or raise 404."""
+    obj = session.get(model, pk, options=options)
+    if obj is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{label} with id={pk} not found.",
+        )
+    return obj
+
+
+def _clear_lookup_cache() -> None:
+    """Drop all cached lookups and entries, e.g. after new data was imported."""
+    with _lookup_cache_lock:
+        _lookup_cache.clear()
+    with _by_id_cache_lock:
+        _by_id_cache.clear()
+    with _similar_names_cache_lock:
+        _similar_names_cache.clear()
+
+
+def _warm_lookup_cache(session: Session) -> None:
+    """Run the aggregating lookups once, so no request has to wait for them."""
+    _name_rank_counts_json(session)
+    _name_status_counts_json(session)
+    _name_relation_types_json(session)
+    _family_list_json(session)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Initialize app resources on startup and cleanup on shutdown."""
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     engine = get_engine()
     app.state.engine = engine
     app.state.session_factory = create_session_factory(engine)
-    manager.DbManager(engine)
     yield
     app.state.engine.dispose()
 
@@ -112,19 +391,32 @@ app.add_middleware(
 )
 
 
-def run_api(host: str = "0.0.0.0", port: int = 8000) -> None:
+def run_api(host: str = "0.0.0.0", port: int = 8000, workers: int = 1) -> None:
+    # fuzzy name search is CPU-bound, so one worker process serves at most one
+    # core; uvloop and httptools come with fastapi[standard] except on Windows
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    if loop == "asyncio":
+        logger.warning("uvloop is not installed, using the slower asyncio loop.")
     uvicorn.run(
         app="biokb_ipni.api.main:app",
         host=host,
         port=port,
+        workers=workers,
+        loop=loop,
         log_level="warning",
     )
 
 
-def verify_credentials(credentials: HTTPBasicCredentials = Depends(HTTPBasic())):
-    is_correct_username = secrets.compare_digest(credentials.username, USERNAME)
-    is_correct_password = secrets.compare_digest(credentials.password, PASSWORD)
-    if not (is_correct_username and is_correct_password):
+security = HTTPBasic()
+
+
+def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
+    # one constant-time comparison of both; bytes, as compare_digest rejects
+    # non-ASCII strings (a username can not contain a colon in Basic auth)
+    if not secrets.compare_digest(
+        f"{credentials.username}:{credentials.password}".encode(),
+        f"{USERNAME}:{PASSWORD}".encode(),
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -137,10 +429,13 @@ def verify_credentials(credentials: HTTPBasicCredentials = Depends(HTTPBasic()))
 ###############################################################################
 @app.post(
     path="/import_data/",
-    response_model=dict[str, int],
+    response_model=schemas.Job,
+    status_code=status.HTTP_202_ACCEPTED,
     tags=[Tag.DB_MANAGE],
 )
-async def import_data(
+def import_data(
+    request: Request,
+    background_tasks: BackgroundTasks,
     credentials: HTTPBasicCredentials = Depends(verify_credentials),
     force_download: bool = Query(
         False,
@@ -156,51 +451,97 @@ async def import_data(
             " after importing them into the database."
         ),
     ),
-) -> dict[str, int]:
-    """Download data (if not exists) and load in database.
+) -> schemas.Job:
+    """Download data (if not exists) and load in database in the background.
 
-    Can take up to 15 minutes to complete.
+    Can take up to 15 minutes to complete. Poll `/jobs/{job_id}` for the status;
+    the result of a finished job are the numbers of imported rows per table.
     """
-    try:
-        dbm = manager.DbManager()
-        result = dbm.import_data(
+    engine = request.app.state.engine
+    session_factory = request.app.state.session_factory
+
+    def import_and_clear_cache() -> dict[str, int]:
+        result = manager.DbManager(engine).import_data(
             force_download=force_download, delete_files=delete_files
         )
-    except Exception as e:
-        logger.error(f"Error importing data: {e}")
+        with session_factory() as session:
+            _clear_caches_if_reimported(session, force=True)
+            _warm_lookup_cache(session)
+        return result
+
+    return jobs.start_job(background_tasks, "import_data", import_and_clear_cache)
+
+
+@app.get("/jobs/{job_id}", response_model=schemas.Job, tags=[Tag.DB_MANAGE])
+def get_job(
+    job_id: str,
+    credentials: HTTPBasicCredentials = Depends(verify_credentials),
+) -> schemas.Job:
+    """Get the status of a background job, e.g. started by `/import_data/`."""
+    job = jobs.get_job(job_id)
+    if not job:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error importing data. {e}",
-        ) from e
-    return result
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id={job_id} not found.",
+        )
+    return job
 
 
-@app.get("/export_ttls/", tags=[Tag.DB_MANAGE])
-async def get_report(
+@app.get(
+    "/export_ttls/",
+    response_model=schemas.Job,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=[Tag.DB_MANAGE],
+)
+def get_report(
+    request: Request,
+    background_tasks: BackgroundTasks,
     credentials: HTTPBasicCredentials = Depends(verify_credentials),
     force_create: bool = Query(
         False,
         description="Whether to re-generate the TTL files even if they already exist.",
     ),
-) -> FileResponse:
+) -> schemas.Job:
+    """Generate the zipped TTL files (if not exist) in the background.
 
-    file_path = ZIPPED_TTLS_PATH
-    if not os.path.exists(file_path) or force_create:
-        try:
-            TurtleCreator().create_ttls()
-        except Exception as e:
-            logger.error(f"Error generating TTL files: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error generating TTL files. Data already imported?",
-            ) from e
+    Poll `/jobs/{job_id}` for the status and get the files from
+    `/export_ttls/download` once the job has finished.
+    """
+    engine = request.app.state.engine
+
+    def create_ttls() -> None:
+        if not os.path.exists(ZIPPED_TTLS_PATH) or force_create:
+            TurtleCreator(engine).create_ttls()
+
+    return jobs.start_job(background_tasks, "export_ttls", create_ttls)
+
+
+@app.get("/export_ttls/download", tags=[Tag.DB_MANAGE])
+def download_ttls(
+    credentials: HTTPBasicCredentials = Depends(verify_credentials),
+) -> FileResponse:
+    """Download the zipped TTL files generated by `/export_ttls/`."""
+    if not os.path.exists(ZIPPED_TTLS_PATH):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=(
+                "Zipped TTL files not found. Please "
+                "generate them first using /export_ttls/ endpoint."
+            ),
+        )
     return FileResponse(
-        path=file_path, filename="ttls.zip", media_type="application/zip"
+        path=ZIPPED_TTLS_PATH, filename="ttls.zip", media_type="application/zip"
     )
 
 
-@app.get("/import_neo4j/", tags=[Tag.DB_MANAGE])
-async def import_neo4j(
+@app.get(
+    "/import_neo4j/",
+    response_model=schemas.Job,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=[Tag.DB_MANAGE],
+)
+def import_neo4j(
+    background_tasks: BackgroundTasks,
     credentials: HTTPBasicCredentials = Depends(verify_credentials),
     uri: str | None = Query(
         default=os.environ.get("NEO4J_URI") or NEO4J_URI,
@@ -217,33 +558,130 @@ async def import_neo4j(
         description="The Neo4j password. If not provided,"
         " the default from environment variable is used.",
     ),
-) -> dict[str, str]:
-    """Import RDF turtle files in Neo4j."""
-    try:
-        if not os.path.exists(ZIPPED_TTLS_PATH):
-            raise HTTPException(
-                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
-                detail=(
-                    "Zipped TTL files not found. Please "
-                    "generate them first using /export_ttls/ endpoint."
-                ),
-            )
-        importer = Neo4jImporter(neo4j_uri=uri, neo4j_user=user, neo4j_pwd=password)
-        importer.import_ttls()
-    except Exception as e:
-        logger.error(f"Error importing data into Neo4j: {e}")
+) -> schemas.Job:
+    """Import RDF turtle files in Neo4j in the background.
+
+    Poll `/jobs/{job_id}` for the status.
+    """
+    if not os.path.exists(ZIPPED_TTLS_PATH):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error importing data into Neo4j: {e}",
-        ) from e
-    return {"status": "Neo4j import completed successfully."}
+            status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+            detail=(
+                "Zipped TTL files not found. Please "
+                "generate them first using /export_ttls/ endpoint."
+            ),
+        )
+
+    def import_ttls() -> bool:
+        importer = Neo4jImporter(neo4j_uri=uri, neo4j_user=user, neo4j_pwd=password)
+        return importer.import_ttls()
+
+    return jobs.start_job(background_tasks, "import_neo4j", import_ttls)
 
 
 ###############################################################################
 # Name
 ###############################################################################
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards, so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def score_candidates(
+    query: str, names: Sequence[str], score_cutoff: float | None = None
+) -> np.ndarray:
+    """Return the normalized Levenshtein similarity of `query` to each name.
+
+    Scores are identical to `Levenshtein.ratio`, but all names are scored in a
+    single call with the bit-parallel RapidFuzz kernel outside of the GIL.
+    With `score_cutoff`, pairs which cannot reach it (e.g. because of their
+    length difference) are rejected early and scored 0.
+    """
+    scores: np.ndarray = process.cdist(
+        [query],
+        names,
+        scorer=Indel.normalized_similarity,
+        score_cutoff=score_cutoff,
+        workers=-1,
+    )
+    # the only row of the score matrix, for the only query
+    return scores.reshape(-1)
+
+
+def _score_streamed(
+    session: Session, stmt: Executable, query: str, score_cutoff: float
+) -> tuple[list[str], np.ndarray]:
+    """Score the names selected by `stmt` in batches while streaming the rows.
+
+    Only the IDs of rows scoring at least `score_cutoff` are kept, so the memory
+    used does not grow with the number of names selected.
+    """
+    candidate_ids: list[str] = []
+    scores: list[np.ndarray] = []
+    result = session.execute(stmt, execution_options={"yield_per": 5000})
+    for batch in result.partitions():
+        batch_scores = score_candidates(
+            query, [row.scientific_name for row in batch], score_cutoff=score_cutoff
+        )
+        kept = np.flatnonzero(batch_scores)
+        candidate_ids.extend(batch[i].id for i in kept.tolist())
+        scores.append(batch_scores[kept])
+    return candidate_ids, np.concatenate(scores) if scores else np.zeros(0)
+
+
+_SIMILAR_NAME_LIST_ADAPTER = TypeAdapter(list[schemas.NameSearchSimilarNameResult])
+
+
+def _similar_name_entries(
+    names: Sequence[models.Name],
+    calculate_with: SimilarityMethod,
+    similarities: Iterable[float],
+) -> list[schemas.NameSearchSimilarNameResult]:
+    """Validate all names in one pass and set how similar they are."""
+    entries = _SIMILAR_NAME_LIST_ADAPTER.validate_python(names, from_attributes=True)
+    for entry, similarity in zip(entries, similarities):
+        entry.calculate_with = calculate_with
+        entry.similarity = similarity
+    return entries
+
+
+def _to_similar_name_results(
+    session: Session,
+    candidate_ids: Sequence[str],
+    scores: np.ndarray,
+    calculate_with: SimilarityMethod,
+    threshold: float,
+    limit: int | None = None,
+) -> list[schemas.NameSearchSimilarNameResult]:
+    """Build response entries, best first, for candidates scoring above threshold.
+
+    Thresholding and ranking of the candidates happen in NumPy; only the names
+    which survive threshold and limit are loaded completely and validated.
+    """
+    hits = np.flatnonzero(scores > threshold)
+    hits = hits[np.argsort(-scores[hits], kind="stable")][:limit]
+    names = _load_names(session, [candidate_ids[i] for i in hits.tolist()])
+    return _similar_name_entries(
+        names, calculate_with, (round(float(scores[i]), 2) for i in hits)
+    )
+
+
+def _load_names(session: Session, ids: Sequence[str]) -> list[models.Name]:
+    """Load the names with the given IDs in this order, with family and reference."""
+    if not ids:
+        return []
+    stmt = (
+        select(models.Name)
+        .where(models.Name.id.in_(ids))
+        .options(joinedload(models.Name.family), joinedload(models.Name.reference))
+    )
+    names = {name.id: name for name in session.scalars(stmt)}
+    return [names[id] for id in ids]
+
+
 @app.get("/name/by_id/", response_model=schemas.Name, tags=[Tag.NAME])
-async def get_name_by_id(
+@_cached_by_id
+def get_name_by_id(
     name_id: str = Query(
         ...,
         description="Name ID to search for",
@@ -253,234 +691,375 @@ async def get_name_by_id(
         },
     ),
     session: Session = Depends(get_session),
-) -> models.Name | None:
+) -> schemas.Name:
     """Get a IPNI entry by the name ID."""
-    obj = session.get(models.Name, name_id)
-    if not obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Name with id={name_id} not found.",
-        )
-    return obj
-
+    obj = _get_or_404(
+        session,
+        models.Name,
+        name_id,
+        "Name",
+        options=[
+            joinedload(models.Name.family),
+            joinedload(models.Name.reference),
+            selectinload(models.Name.type_materials),
+            raiseload("*"),
+        ],
+    )
+    return schemas.Name.model_validate(obj)
 
-@app.get(
-    "/names/find_similar",
-    response_model=list[schemas.NameSearchSimilarNameResult],
-    tags=[Tag.NAME],
-)
-async def names_find_similar(
-    session: Session = Depends(get_session),
-    search_for_name: str = Query(
-        ...,
-        description="Name to search for",
-        openapi_examples={
-            "example 1": {"value": "Phaseolus vulgare L."},
-            "example 2": {"value": "acHila meliflium"},
-            "example 3": {"value": "Almue Fera"},
-        },
-    ),
-    first_x_letters: int = Query(
-        2,
-        minimum=1,
-        description="Number of first letters at the beginning of the name which have to be identical to the search name. This is used to reduce the number of candidates for similarity search.",
-    ),
-):
-    """Fuzzy search for similar names using exact match, Metaphone, and Jaro-Winkler algorithms.
 
-    If more than 2 words are provided, the assumption is that the first two words are the genus
-    and species and last words are the authorship for exact match."""
-    search_for_name = re.sub(r"\s+", " ", search_for_name.strip())
-    name_splitted = [x.strip() for x in search_for_name.split(" ")]
+def find_similar_names(
+    session: Session, search_for_name: str, first_x_letters: int = 2
+) -> list[schemas.NameSearchSimilarNameResult]:
+    """Find names similar to `search_for_name`, best first.
 
-    query = session.query(models.Name)
+    Raises:
+        HTTPException: 404 if no similar name is found.
+    """
+    # str.split() without arguments collapses whitespace runs in C, no regex needed
+    name_splitted = search_for_name.split()
+    search_for_name = " ".join(name_splitted)
+    # shorter queries would match (almost) all names in the fallbacks
+    if len(search_for_name) < 2:
+        # the name of the constant differs between Starlette versions
+        raise HTTPException(
+            status_code=422,
+            detail="Name to search for must have at least 2 characters.",
+        )
 
-    # First, check for exact match
-    # If an exact match is found, return it immediately.
+    # The exact match is checked on the same rows as the phonetic candidates, so
+    # both are fetched in one round trip: exact hits always share the prefixes.
     search_name = (
         " ".join(name_splitted[:2]) if len(name_splitted) > 1 else search_for_name
     )
     authorship = " ".join(name_splitted[2:]) if len(name_splitted) > 2 else None
-    query = query.where(models.Name.scientific_name == search_name)
-    if authorship:
-        query = query.where(models.Name.authorship == authorship)
-    exact_results = query.all()
-    if exact_results:
-        calculate_with = "exact"
-        similarity = 1.0
-        return_values: list[schemas.NameSearchSimilarNameResult] = []
-        for exact_result in exact_results:
-            entry = schemas.NameSearchSimilarNameResult.model_validate(exact_result)
-            entry.calculate_with = calculate_with
-            entry.similarity = similarity
-            return_values.append(entry)
-        return return_values
-
-    # If no exact match, use phonetic similarity with Metaphone algorithm
-    # Metaphone is better than soundex for non-English names including Latin scientific names
-    # Also try Jaro-Winkler which works well for scientific names with shared prefixes
-    name_metaphone = jellyfish.metaphone(search_for_name)
 
     search_authorship_prefix = None
-    search_for_prefixes = f"{name_splitted[0][:first_x_letters]}%"
+    prefixes = [_escape_like(x[:first_x_letters]) for x in name_splitted]
+    search_for_prefixes = f"{prefixes[0]}%"
     if len(name_splitted) >= 2:
-        search_for_prefixes += f"{name_splitted[1][:first_x_letters]}%"
+        search_for_prefixes += f"{prefixes[1]}%"
     if len(name_splitted) >= 3:
-        search_authorship_prefix = f"{name_splitted[2][:first_x_letters]}%"
+        search_authorship_prefix = f"{prefixes[2]}%"
 
-    # Get names that start with same letter to reduce the dataset for phonetic comparison
-    query = session.query(models.Name).where(
-        models.Name.scientific_name.like(f"{search_for_prefixes}")
+    is_exact = models.Name.scientific_name == search_name
+    if authorship:
+        # NULL for names without authorship, which PostgreSQL sorts first below
+        is_exact = func.coalesce(
+            and_(is_exact, models.Name.authorship == authorship), false()
+        )
+    authorship_matches = (
+        models.Name.authorship.like(search_authorship_prefix, escape="\\")
+        if search_authorship_prefix
+        else false()
     )
-    count_query_authorship = 0
-    query_authorship = None
-    if search_authorship_prefix:
-        query_authorship = query.where(
-            models.Name.authorship.like(f"{search_authorship_prefix}")
+    # Metaphone is better than soundex for non-English names including Latin
+    # scientific names; the indexed key adds phonetic hits with other prefixes.
+    name_metaphone = jellyfish.metaphone(search_for_name)
+    # only the columns needed for scoring, complete names are loaded for the hits
+    is_exact_column = is_exact.label("is_exact")
+    result = session.execute(
+        select(
+            models.Name.id,
+            models.Name.scientific_name,
+            models.Name.scientific_name_lc,
+            models.Name.metaphone,
+            is_exact_column,
+            authorship_matches.label("authorship_matches"),
         )
-        count_query_authorship = query_authorship.count()
-    if count_query_authorship > 0 and query_authorship is not None:
-        candidates = query_authorship.all()
-    else:
-        candidates = query.all()
-
-    # Filter candidates by Metaphone similarity and Jaro-Winkler
-    phonetic_matches = []
-    for candidate in candidates:
-        candidate_metaphone = jellyfish.metaphone(candidate.scientific_name)
-
-        # Check if metaphone codes match
-        metaphone_match = name_metaphone == candidate_metaphone
-
-        # Also check Jaro-Winkler similarity for scientific names (good for genus/species prefixes)
-        jaro_similarity = jellyfish.jaro_winkler_similarity(
-            search_for_name.lower(), candidate.scientific_name.lower()
+        .where(
+            or_(
+                models.Name.scientific_name_lc.like(
+                    search_for_prefixes.lower(), escape="\\"
+                ),
+                models.Name.metaphone == name_metaphone,
+            )
         )
+        .order_by(is_exact_column.desc())
+    )
+    # exact matches are sorted first, the other candidates are only fetched
+    # if there is none
+    exact_ids: list[str] = []
+    rows = []
+    for row in result:
+        if row.is_exact:
+            exact_ids.append(row.id)
+        elif exact_ids:
+            break
+        else:
+            rows.append(row)
+            rows.extend(result.all())
+    result.close()
 
-        if metaphone_match or jaro_similarity > 0.8:
-            # Calculate combined similarity score
-            sequence_ratio = SequenceMatcher(
-                None, search_for_name.lower(), candidate.scientific_name.lower()
-            ).ratio()
-            final_similarity = max(jaro_similarity, sequence_ratio)
+    # If an exact match is found, return it immediately.
+    exact_results = _load_names(session, exact_ids)
+    if exact_results:
+        return _similar_name_entries(
+            exact_results, SimilarityMethod.EXACT, [1.0] * len(exact_results)
+        )
 
-            if final_similarity > 0.5:
-                entry = schemas.NameSearchSimilarNameResult.model_validate(candidate)
-                entry.calculate_with = "metaphone_jaro"
-                entry.similarity = round(final_similarity, 2)
-                phonetic_matches.append(entry)
+    # If no exact match, use phonetic similarity with Metaphone algorithm
+    # Also try Jaro-Winkler which works well for scientific names with shared prefixes
 
+    # Names sharing the prefixes or the Metaphone key reduce the dataset for
+    # phonetic comparison, narrowed down to the authorship prefix if any matches it.
+    candidates = [row for row in rows if row.authorship_matches]
+    if not candidates:
+        candidates = rows
+
+    # Filter candidates by Metaphone similarity and Jaro-Winkler, both keys of
+    # the names are stored on insert
+    metaphone_match = np.array([c.metaphone for c in candidates]) == name_metaphone
+    search_lower = search_for_name.lower()
+    names_lower = [c.scientific_name_lc for c in candidates]
+    # the exact Jaro-Winkler similarity is only needed for Metaphone matches,
+    # the others pass only above 0.8 and are cut off early below it
+    jaro_similarity = np.zeros(len(candidates), dtype=np.float32)
+    for subset, score_cutoff in ((metaphone_match, None), (~metaphone_match, 0.8)):
+        indices = np.flatnonzero(subset)
+        jaro_similarity[indices] = process.cdist(
+            [search_lower],
+            [names_lower[i] for i in indices],
+            scorer=JaroWinkler.normalized_similarity,
+            score_cutoff=score_cutoff,
+            workers=-1,
+        )[0]
+    # combined similarity score for candidates passing one of both checks, the
+    # Levenshtein ratio is only computed for those
+    passing = np.flatnonzero(metaphone_match | (jaro_similarity > 0.8))
+    final_similarity = np.zeros(len(candidates))
+    final_similarity[passing] = np.maximum(
+        jaro_similarity[passing],
+        score_candidates(
+            search_lower, [names_lower[i] for i in passing], score_cutoff=0.5
+        ),
+    )
+    phonetic_matches = _to_similar_name_results(
+        session,
+        [c.id for c in candidates],
+        final_similarity,
+        SimilarityMethod.METAPHONE_JARO,
+        threshold=0.5,
+        limit=30,
+    )
     if phonetic_matches:
-        return sorted(phonetic_matches, key=lambda x: x.similarity, reverse=True)[:30]
+        return phonetic_matches
+
+    # On PostgreSQL the pg_trgm GiST index ranks and limits the candidates
+    # (nearest neighbours by trigram distance), so no rows have to be scored in
+    # Python and the matches are not sorted completely.
+    if session.get_bind().dialect.name == "postgresql":
+        trigram_distance = models.Name.scientific_name.op("<->", return_type=Float)(
+            search_for_name
+        )
+        stmt = (
+            select(models.Name, (1 - trigram_distance).label("similarity"))
+            .where(models.Name.scientific_name.op("%")(search_for_name))
+            .options(joinedload(models.Name.family), joinedload(models.Name.reference))
+            .order_by(trigram_distance)
+            .limit(30)
+        )
+        trigram_rows = session.execute(stmt).all()
+        trigram_matches = _similar_name_entries(
+            [row.Name for row in trigram_rows],
+            SimilarityMethod.TRIGRAM,
+            (round(row.similarity, 2) for row in trigram_rows),
+        )
+        if trigram_matches:
+            return trigram_matches
 
-    results = []
-    ratios = []
-    # If no phonetic matches, fall back to pattern-based search with Levenshtein distance
+        # Last resort: names sharing at least one word (GIN full-text index),
+        # rescored in Python on the small filtered set.
+        search_vector = func.to_tsvector(
+            literal_column("'simple'"), models.Name.scientific_name
+        )
+        search_query = func.websearch_to_tsquery(
+            literal_column("'simple'"), " or ".join(name_splitted)
+        )
+        # the Levenshtein ratio is bounded by the length difference, so the
+        # names closest in length are the ones kept for scoring
+        length_difference = func.abs(
+            func.length(models.Name.scientific_name) - len(search_for_name)
+        )
+        stmt = (
+            select(models.Name.id, models.Name.scientific_name)
+            .where(search_vector.op("@@")(search_query))
+            .order_by(length_difference)
+        )
+        candidate_ids, scores = _score_streamed(
+            session, stmt.limit(1000), search_for_name, score_cutoff=0.3
+        )
+        word_matches = _to_similar_name_results(
+            session,
+            candidate_ids,
+            scores,
+            SimilarityMethod.LEVENSHTEIN,
+            threshold=0.3,
+            limit=3,
+        )
+        if not word_matches:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Name '{search_for_name}' not found.",
+            )
+        return word_matches
 
-    search_str = f"{name_splitted[0][:first_x_letters]}%"
+    # If no phonetic matches, fall back to pattern-based search with Levenshtein distance
+    search_str = f"{prefixes[0]}%"
     if len(name_splitted) > 1:
-        search_str += f" {name_splitted[1][:first_x_letters]}%"
-    query = session.query(models.Name).where(
-        models.Name.scientific_name.like(search_str)
+        search_str += f" {prefixes[1]}%"
+    # lambda statements are built and cache-keyed once, only the patterns are bound
+    stmt3 = lambda_stmt(
+        lambda: select(models.Name.id, models.Name.scientific_name).where(
+            models.Name.scientific_name.like(search_str, escape="\\")
+        )
     )
-    results = query.all()
-
-    # check for similarity
-
-    for result in results:
-        ratio = SequenceMatcher(None, search_for_name, result.scientific_name).ratio()
-        if ratio > 0.3:  # Threshold for similarity
-            entry = schemas.NameSearchSimilarNameResult.model_validate(result)
-            entry.calculate_with = "pattern_match"
-            entry.similarity = round(ratio, 2)
-            ratios.append(entry)
-    if ratios:
-        return sorted(ratios, key=lambda x: x.similarity, reverse=True)
+    candidate_ids, scores = _score_streamed(
+        session, stmt3, search_for_name, score_cutoff=0.3
+    )
+    pattern_matches = _to_similar_name_results(
+        session, candidate_ids, scores, SimilarityMethod.PATTERN_MATCH, threshold=0.3
+    )
+    if pattern_matches:
+        return pattern_matches
 
     # if no results Levenshtein
-    if not ratios:
-        stmt4 = select(models.Name).where(
+    same_start = f"{_escape_like(search_for_name[0])}%"
+    # short queries would match too many names by their end
+    same_end = (
+        f"%{_escape_like(search_for_name[-4:])}"
+        if len(search_for_name) >= 4
+        else same_start
+    )
+    # names matching the pattern above all scored too low with the same ratio,
+    # so they are not fetched and scored again
+    stmt4 = lambda_stmt(
+        lambda: select(models.Name.id, models.Name.scientific_name).where(
             or_(
-                models.Name.scientific_name.like(f"{search_for_name[0]}%"),
-                models.Name.scientific_name.like(f"%{search_for_name[-4:]}"),
-            )
+                models.Name.scientific_name.like(same_start, escape="\\"),
+                models.Name.scientific_name.like(same_end, escape="\\"),
+            ),
+            models.Name.scientific_name.not_like(search_str, escape="\\"),
         )
-        results = session.execute(stmt4).all()
-
-        for result in results:
-            ratio = Levenshtein.ratio(search_for_name, result.scientific_name)
-            if ratio > 0.3:
-                entry = schemas.NameSearchSimilarNameResult.model_validate(result)
-                entry.calculate_with = "levenshtein"
-                entry.similarity = round(ratio, 2)
-                ratios.append(entry)
-        if ratios:
-            return sorted(ratios, key=lambda x: x.similarity, reverse=True)[:3]
-
-    if not results:
+    )
+    candidate_ids, scores = _score_streamed(
+        session, stmt4, search_for_name, score_cutoff=0.3
+    )
+    levenshtein_matches = _to_similar_name_results(
+        session,
+        candidate_ids,
+        scores,
+        SimilarityMethod.LEVENSHTEIN,
+        threshold=0.3,
+        limit=3,
+    )
+    if not levenshtein_matches:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Name '{search_for_name}' not found.",
         )
+    return levenshtein_matches
+
+
+# Recurring queries (retries, typeahead) are answered from the serialized
+# response; keyed by the normalized query, not found errors are not cached.
+_similar_names_cache: TTLCache[Any, bytes] = TTLCache(maxsize=4096, ttl=3600)
+_similar_names_cache_lock = threading.Lock()
+
+
+@app.get(
+    "/names/find_similar",
+    response_model=list[schemas.NameSearchSimilarNameResult],
+    tags=[Tag.NAME],
+)
+def names_find_similar(
+    session: Session = Depends(get_session),
+    search_for_name: str = Query(
+        ...,
+        min_length=2,
+        description="Name to search for",
+        openapi_examples={
+            "example 1": {"value": "Phaseolus vulgare L."},
+            "example 2": {"value": "acHila meliflium"},
+            "example 3": {"value": "Almue Fera"},
+        },
+    ),
+    first_x_letters: int = Query(
+        2,
+        minimum=1,
+        description="Number of first letters at the beginning of the name which have to be identical to the search name. This is used to reduce the number of candidates for similarity search.",
+    ),
+) -> Response:
+    """Fuzzy search for similar names using exact match, Metaphone, and Jaro-Winkler algorithms.
 
+    If more than 2 words are provided, the assumption is that the first two words are the genus
+    and species and last words are the authorship for exact match.
 
-@app.get("/name/ranks/", tags=[Tag.NAME])
-async def name_ranks(
+    Without phonetic matches, PostgreSQL returns the nearest names by trigram
+    distance from its index; other databases fall back to Levenshtein ratios of
+    names sharing prefixes.
+    """
+    _clear_caches_if_reimported(session)
+    key = hashkey(" ".join(search_for_name.split()), first_x_letters)
+    with _similar_names_cache_lock:
+        content = _similar_names_cache.get(key)
+    if content is None:
+        results = find_similar_names(session, search_for_name, first_x_letters)
+        # the entries are already validated, so they are dumped in one pass
+        # instead of being validated again against the response_model
+        content = _SIMILAR_NAME_LIST_ADAPTER.dump_json(results)
+        with _similar_names_cache_lock:
+            _similar_names_cache[key] = content
+    return Response(content=content, media_type="application/json")
+
+
+@app.get("/name/ranks/", response_model=list[schemas.NameRankCount], tags=[Tag.NAME])
+def name_ranks(
     session: Session = Depends(get_session),
-):
+) -> Response:
     """Get all distinct ranks in names."""
-    ranks = (
-        session.query(models.Name.rank, func.count(models.Name.rank))
-        .group_by(models.Name.rank)
-        .order_by(func.count(models.Name.rank).desc())
-        .all()
+    return Response(
+        content=_name_rank_counts_json(session), media_type="application/json"
     )
-    return [{"rank": r[0], "count": r[1]} for r in ranks if r[0] is not None]
 
 
-@app.get("/name/statuses/", tags=[Tag.NAME])
-async def name_statuses(
+@app.get(
+    "/name/statuses/", response_model=list[schemas.NameStatusCount], tags=[Tag.NAME]
+)
+def name_statuses(
     session: Session = Depends(get_session),
-):
+) -> Response:
     """Get all distinct status in names."""
-    statuses = (
-        session.query(models.Name.status, func.count(models.Name.status).label("count"))
-        .group_by(models.Name.status)
-        .order_by(func.count(models.Name.status).desc())
-        .all()
+    return Response(
+        content=_name_status_counts_json(session), media_type="application/json"
     )
-    result = [
-        {"status": s.status, "count": s.count} for s in statuses if s.status is not None
-    ]
-    print(result)
-    return result
 
 
-@app.get(
-    "/names/search/", response_model=schemas.NameSearchResult | dict, tags=[Tag.NAME]
-)
-async def search_names(
-    search: schemas.NameSearch = Depends(schemas.NameSearch),
+@app.get("/names/search/", response_model=schemas.NameSearchResult, tags=[Tag.NAME])
+def search_names(
+    search: Annotated[schemas.NameSearch, Query()],
     session: Session = Depends(get_session),
-):
+) -> Response:
     """Searches for names based on various fields.
 
     **Tips**:
     - Use `%` as wildcard for partial matches in string fields.
     - Get family_id from `/families/search/` endpoint.
     """
-    return build_dynamic_query(
+    result = build_dynamic_query(
         search_obj=search,
         model_cls=models.Name,
         session=session,
     )
+    return _search_response(schemas.NameSearchResult, result)
 
 
 ###############################################################################
 # Reference
 ###############################################################################
 @app.get("/reference/by_id/", response_model=schemas.Reference, tags=[Tag.REFERENCE])
-async def get_reference(
+@_cached_by_id
+def get_reference(
     ref_id: str = Query(
         ...,
         description="Reference ID to search for",
@@ -490,14 +1069,20 @@ async def get_reference(
         },
     ),
     session: Session = Depends(get_session),
-) -> models.Reference | None:
-    obj = session.get(models.Reference, ref_id)
-    if not obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Reference with id={ref_id} not found.",
-        )
-    return obj
+) -> schemas.Reference:
+    obj = _get_or_404(
+        session,
+        models.Reference,
+        ref_id,
+        "Reference",
+        options=[
+            selectinload(models.Reference.names).load_only(
+                models.Name.id, models.Name.scientific_name
+            ),
+            raiseload("*"),
+        ],
+    )
+    return schemas.Reference.model_validate(obj)
 
 
 @app.get(
@@ -505,22 +1090,24 @@ async def get_reference(
     response_model=schemas.ReferenceSearchResult,
     tags=[Tag.REFERENCE],
 )
-async def search_references(
-    search: schemas.ReferenceSearch = Depends(schemas.ReferenceSearch),
+def search_references(
+    search: Annotated[schemas.ReferenceSearch, Query()],
     session: Session = Depends(get_session),
-) -> SASearchResults | dict[str, str]:
-    return build_dynamic_query(
+) -> Response:
+    result = build_dynamic_query(
         search_obj=search,
         model_cls=models.Reference,
         session=session,
     )
+    return _search_response(schemas.ReferenceSearchResult, result)
 
 
 # ###############################################################################
 # Family
 # ###############################################################################
 @app.get("/family/by_id/", response_model=schemas.Family, tags=[Tag.FAMILY])
-async def get_family(
+@_cached_by_id
+def get_family(
     id: str = Query(
         ...,
         description="Family ID to search for",
@@ -530,50 +1117,58 @@ async def get_family(
         },
     ),
     session: Session = Depends(get_session),
-):
+) -> schemas.Family:
     """Get a family by internal database ID (used in names).
 
     Additionally returns the associated name IDs.
     """
-    family: manager.Family | None = session.get(models.Family, id)
-    if not family:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Family with id={id} not found.",
-        )
-    else:
-        # get name_ids
-        stmt = select(models.Name.id).filter(models.Name.family_id == family.id)
-        result = session.execute(stmt).all()
-        name_ids = [id for (id,) in result]
-    family_dict = schemas.Family.model_validate(family).model_dump()
-    return {**family_dict, "name_ids": name_ids}
+    family = _get_or_404(session, models.Family, id, "Family")
+    # get name_ids (from the covering index on family_id and id)
+    stmt = select(models.Name.id).filter(models.Name.family_id == family.id)
+    name_ids = session.scalars(stmt).all()
+    # Family.name_ids would lazy-load complete Name rows, only the IDs are needed
+    family_dict = schemas.FamilyWithId.model_validate(
+        family, from_attributes=True
+    ).model_dump()
+    # both parts are validated or typed by the database already, so the (possibly
+    # very long) list of name IDs is not validated once more
+    return schemas.Family.model_construct(**family_dict, name_ids=list(name_ids))
 
 
 @app.get("/families/", response_model=List[schemas.FamilyWithId], tags=[Tag.FAMILY])
-async def family_families(
+def family_families(
+    request: Request,
     session: Session = Depends(get_session),
-) -> List[models.Family]:
+) -> Response:
     """Get all distinct families.
 
     - **tax_id**: NCBI Taxonomy ID for the family https://purl.obolibrary.org/obo/NCBITaxon_{tax_id}.
     - **id**: internal database ID for the family which can be used to link with names.
     """
-    return session.query(models.Family).order_by(models.Family.family).all()
+    content, compressed, etag = _family_list_json(session)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        content = compressed
+        headers["Content-Encoding"] = "gzip"
+    # returning a Response skips FastAPI's per-item response_model validation
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @app.get(
     "/families/search/", response_model=schemas.FamilySearchResult, tags=[Tag.FAMILY]
 )
-async def search_families(
-    search: schemas.FamilySearch = Depends(schemas.FamilySearch),
+def search_families(
+    search: Annotated[schemas.FamilySearch, Query()],
     session: Session = Depends(get_session),
-) -> SASearchResults | dict[str, str]:
-    return build_dynamic_query(
+) -> Response:
+    result = build_dynamic_query(
         search_obj=search,
         model_cls=models.Family,
         session=session,
     )
+    return _search_response(schemas.FamilySearchResult, result)
 
 
 # ###############################################################################
@@ -581,15 +1176,14 @@ async def search_families(
 # ###############################################################################
 
 
-@app.get("/name_relation_types/", tags=[Tag.NAME_RELATION])
-async def name_relation_types(
+@app.get("/name_relation_types/", response_model=List[str], tags=[Tag.NAME_RELATION])
+def name_relation_types(
     session: Session = Depends(get_session),
-) -> List[str]:
+) -> Response:
     """Get all distinct types in name relations."""
-    types = (
-        session.query(models.NameRelation.type).group_by(models.NameRelation.type).all()
+    return Response(
+        content=_name_relation_types_json(session), media_type="application/json"
     )
-    return [t[0] for t in types if t[0] is not None]
 
 
 @app.get(
@@ -597,10 +1191,10 @@ async def name_relation_types(
     response_model=schemas.NameRelationSearchResult,
     tags=[Tag.NAME_RELATION],
 )
-async def search_name_relations(
-    search: schemas.NameRelationSearch = Depends(schemas.NameRelationSearch),
+def search_name_relations(
+    search: Annotated[schemas.NameRelationSearch, Query()],
     session: Session = Depends(get_session),
-):
+) -> Response:
     Name = aliased(models.Name)
     RelatedName = aliased(models.Name)
     stmt = (
@@ -612,8 +1206,8 @@ async def search_name_relations(
             RelatedName.scientific_name.label("related_name"),
         )
         .select_from(models.NameRelation)
-        .join(Name, models.NameRelation.name)
-        .join(RelatedName, models.NameRelation.related_name)
+        .join(Name, models.NameRelation.name_id == Name.id)
+        .join(RelatedName, models.NameRelation.related_name_id == RelatedName.id)
     )
     filters = []
     if search.type:
@@ -626,15 +1220,32 @@ async def search_name_relations(
         filters.append(Name.scientific_name.like(search.name))
     if filters:
         stmt = stmt.where(*filters)
-    # count the total before offset/limit
-    total = session.execute(stmt.with_only_columns(func.count())).scalar_one()
+    count_stmt = stmt.with_only_columns(func.count())
+    if search.after_id is not None:
+        stmt = stmt.where(models.NameRelation.id > search.after_id)
+    # the window function counts the total before offset/limit in the same
+    # query, as long as the keyset condition does not narrow the rows
+    stmt = stmt.add_columns(
+        models.NameRelation.id, func.count().over().label("total")
+    ).order_by(models.NameRelation.id)
     results = session.execute(stmt.offset(search.offset).limit(search.limit)).all()
-    return {
+    if results and search.after_id is None:
+        total = results[0].total
+    elif search.offset == 0 and search.after_id is None:
+        total = 0
+    else:
+        total = session.execute(count_stmt).scalar_one()
+    next_after_id = None
+    if results and len(results) == search.limit:
+        next_after_id = str(results[-1].id)
+    result = {
         "count": total,
         "results": results,
         "offset": search.offset,
         "limit": search.limit,
+        "next_after_id": next_after_id,
     }
+    return _search_response(schemas.NameRelationSearchResult, result)
 
 
 ###############################################################################
@@ -645,16 +1256,12 @@ async def search_name_relations(
     response_model=schemas.TypeMaterial,
     tags=[Tag.TYPE_MATERIAL],
 )
-async def get_type_material(
+@_cached_by_id
+def get_type_material(
     id: int, session: Session = Depends(get_session)
-) -> models.TypeMaterial | None:
-    obj = session.get(models.TypeMaterial, id)
-    if not obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Type material with id={id} not found.",
-        )
-    return obj
+) -> schemas.TypeMaterial:
+    obj = _get_or_404(session, models.TypeMaterial, id, "Type material")
+    return schemas.TypeMaterial.model_validate(obj)
 
 
 @app.get(
@@ -662,15 +1269,16 @@ async def get_type_material(
     response_model=schemas.TypeMaterialSearchResult,
     tags=[Tag.TYPE_MATERIAL],
 )
-async def search_type_materials(
-    search: schemas.TypeMaterialSearch = Depends(schemas.TypeMaterialSearch),
+def search_type_materials(
+    search: Annotated[schemas.TypeMaterialSearch, Query()],
     session: Session = Depends(get_session),
-) -> SASearchResults | dict[str, str]:
-    return build_dynamic_query(
+) -> Response:
+    result = build_dynamic_query(
         search_obj=search,
         model_cls=models.TypeMaterial,
         session=session,
     )
+    return _search_response(schemas.TypeMaterialSearchResult, result)
 
 
 ###############################################################################
@@ -683,16 +1291,10 @@ async def search_type_materials(
     response_model=schemas.Location,
     tags=[Tag.LOCATION],
 )
-async def get_location(
-    id: int, session: Session = Depends(get_session)
-) -> models.Location | None:
-    obj = session.get(models.Location, id)
-    if not obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Location with id={id} not found.",
-        )
-    return obj
+@_cached_by_id
+def get_location(id: int, session: Session = Depends(get_session)) -> schemas.Location:
+    obj = _get_or_404(session, models.Location, id, "Location")
+    return schemas.Location.model_validate(obj)
 
 
 @app.get(
@@ -700,12 +1302,13 @@ async def get_location(
     response_model=schemas.LocationSearchResult,
     tags=[Tag.LOCATION],
 )
-async def search_locations(
-    search: schemas.LocationSearch = Depends(schemas.LocationSearch),
+def search_locations(
+    search: Annotated[schemas.LocationSearch, Query()],
     session: Session = Depends(get_session),
-) -> SASearchResults | dict[str, str]:
-    return build_dynamic_query(
+) -> Response:
+    result = build_dynamic_query(
         search_obj=search,
         model_cls=models.Location,
         session=session,
     )
+    return _search_response(schemas.LocationSearchResult, result)
@@ -2,12 +2,32 @@ import logging
 import sys
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Sequence, Type, TypeAlias, Union, get_args, get_origin
+from enum import Enum
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Sequence,
+    Type,
+    TypeAlias,
+    Union,
+    get_args,
+    get_origin,
+)
 
 from pydantic import BaseModel
-from sqlalchemy import func, inspect, select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import (
+    ColumnElement,
+    SQLColumnExpression,
+    func,
+    inspect,
+    lambda_stmt,
+    select,
+)
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 
+from biokb_ipni.constants import MAX_LIMIT
 from biokb_ipni.db import models
 
 # Configure logging
@@ -17,6 +37,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 from sqlalchemy.dialects import mysql
 
+# Relationships serialized by the search result schemas are loaded with the
+# page (one query per relationship instead of one per row), all others raise.
+_LOADER_OPTIONS: dict[Type[models.Base], tuple[LoaderOption, ...]] = {
+    models.Name: (
+        joinedload(models.Name.family),
+        joinedload(models.Name.reference),
+        selectinload(models.Name.type_materials),
+        raiseload("*"),
+    ),
+    models.Reference: (
+        selectinload(models.Reference.names).load_only(
+            models.Name.id, models.Name.scientific_name
+        ),
+        raiseload("*"),
+    ),
+}
+
 SASearchResults: TypeAlias = dict[
     str,
     int | Sequence[models.Base] | None,
@@ -39,29 +76,55 @@ def build_dynamic_query(
         return {"error": str(e)}
 
 
-def _build_dynamic_query(
-    search_obj: BaseModel,
-    model_cls: Type[models.Base],
-    session: Session,
-):
-    """
-    Build and execute a SQLAlchemy 2.0-style SELECT based on the non-None
-    attributes of a Pydantic model instance.  The operator is inferred from
-    each field's *declared* type, not the runtime value.
-    """
-    filters = []
+def _string_filter(column: SQLColumnExpression[Any], value: str) -> ColumnElement[bool]:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("used string filter")
+    return column.like(value) if ("%" in value) else column == value
+
+
+def _equal_filter(
+    column: SQLColumnExpression[Any], value: object
+) -> ColumnElement[bool]:
+    return column == value
+
+
+def _bool_filter(column: SQLColumnExpression[Any], value: bool) -> ColumnElement[bool]:
+    return column.is_(value)
+
+
+def _date_filter(
+    column: SQLColumnExpression[Any], value: object
+) -> ColumnElement[bool]:
+    # supports equality or simple closed range
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        return column.between(value[0], value[1])
+    return column == value
+
+
+FilterFn: TypeAlias = Callable[[SQLColumnExpression[Any], Any], ColumnElement[bool]]
+FilterPlan: TypeAlias = tuple[tuple[str, SQLColumnExpression[Any], FilterFn], ...]
 
-    # Only the attributes the client actually supplied (`exclude_none`)
-    payload = search_obj.model_dump(exclude_none=True, mode="json")
 
-    for field_name, value in payload.items():
+@lru_cache(maxsize=None)
+def _plan(search_cls: Type[BaseModel], model_cls: Type[models.Base]) -> FilterPlan:
+    """Resolve once per search schema and model which fields can be filtered.
+
+    The operator is inferred from each field's *declared* type, not the runtime
+    value.
+
+    Returns:
+        FilterPlan: (field name, model column, filter function) for every field
+            of the search schema with a matching column / hybrid attr on the model.
+    """
+    plan: list[tuple[str, SQLColumnExpression[Any], FilterFn]] = []
+    for field_name, field_info in search_cls.model_fields.items():
         # Skip if the SQLAlchemy model has no matching column / hybrid attr
         if not hasattr(model_cls, field_name):
             continue
         column = getattr(model_cls, field_name)
 
         # ↓ The type you wrote in the Pydantic model definition
-        declared_type = search_obj.__pydantic_fields__[field_name].annotation
+        declared_type = field_info.annotation
         # Handle Optional types (e.g., Optional[str] or Union[str, None])
         if get_origin(declared_type) is Union:
             args = [arg for arg in get_args(declared_type) if arg is not type(None)]
@@ -69,56 +132,89 @@ def _build_dynamic_query(
                 declared_type = args[0]
         origin = get_origin(declared_type) or declared_type
 
-        # STRING ......................................................................
+        filter_fn: FilterFn
         if origin is str:
-            logger.info("used string filter")
-            filters.append(column.like(value) if ("%" in value) else column == value)
-
-        # NUMBERS .....................................................................
+            filter_fn = _string_filter
         elif origin in (int, float, Decimal):
-            filters.append(column == value)
-
-        # BOOLEANS ....................................................................
+            filter_fn = _equal_filter
         elif origin is bool:
-            filters.append(column.is_(value))
-
-        # DATE / DATETIME – supports equality or simple closed range ...................
+            filter_fn = _bool_filter
         elif origin in (date, datetime):
-            if isinstance(value, (list, tuple)) and len(value) == 2:
-                filters.append(column.between(value[0], value[1]))
-            else:
-                filters.append(column == value)
-
+            filter_fn = _date_filter
         elif isinstance(origin, type) and issubclass(origin, Enum):
-            filters.append(column == value)
-
-        # FALLBACK .....................................................................
+            filter_fn = _equal_filter
         else:
             logger.warning(
                 f"Unsupported type for field '{field_name}': {declared_type}. "
                 "Using equality operator as fallback."
             )
-            filters.append(column == value)
+            filter_fn = _equal_filter
+        plan.append((field_name, column, filter_fn))
+    return tuple(plan)
 
-    stmt = select(model_cls).where(*filters)
+
+def _build_dynamic_query(
+    search_obj: BaseModel,
+    model_cls: Type[models.Base],
+    session: Session,
+):
+    """
+    Build and execute a SQLAlchemy 2.0-style SELECT based on the non-None
+    attributes of a Pydantic model instance.  The operator is inferred from
+    each field's *declared* type, not the runtime value.
+    """
+    # Only the attributes the client actually supplied (`exclude_none`)
+    payload = search_obj.model_dump(exclude_none=True, mode="json")
+
+    # lambda statements are cached by SQLAlchemy, so the SQL is only compiled once
+    # per combination of model and filter structure; the values are bound params
+    stmt = lambda_stmt(lambda: select(model_cls), track_on=[model_cls])
+    for field_name, column, filter_fn in _plan(type(search_obj), model_cls):
+        value = payload.get(field_name)
+        if value is not None:
+            criterion = filter_fn(column, value)
+            stmt = stmt.add_criteria(lambda s: s.where(criterion), track_on=[criterion])
 
     count_stmt = select(func.count()).select_from(stmt.subquery())
     total_count = session.execute(count_stmt).scalar()
 
-    limit = payload.get("limit")
-    if limit is not None:
-        stmt = stmt.limit(limit)
+    # keyset pagination: an indexed range scan on the primary key, independent of
+    # the page depth (in contrast to OFFSET, which has to skip all previous rows)
+    mapper = inspect(model_cls)
+    primary_key = mapper.primary_key[0]
+    # validated against the type of the primary key by the search schema
+    after_id = payload.get("after_id")
+    if after_id is not None:
+        after = primary_key > after_id
+        stmt = stmt.add_criteria(lambda s: s.where(after), track_on=[after])
+    stmt = stmt.add_criteria(lambda s: s.order_by(primary_key), track_on=[primary_key])
+
+    # never load a whole (filtered) table, even for search schemas without limit
+    limit = max(1, min(payload.get("limit", MAX_LIMIT), MAX_LIMIT))
+    stmt = stmt.add_criteria(lambda s: s.limit(limit))
     offset = payload.get("offset")
     if offset is not None:
-        stmt = stmt.offset(offset)
+        stmt = stmt.add_criteria(lambda s: s.offset(offset))
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "%s",
+            stmt.compile(
+                dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}
+            ),
+        )
 
-    logger.info(
-        stmt.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True})
-    )
+    options = _LOADER_OPTIONS.get(model_cls, (raiseload("*"),))
+    results = session.execute(stmt.options(*options)).scalars().all()
+    next_after_id = None
+    if results and len(results) == limit:
+        primary_key_attr = mapper.get_property_by_column(primary_key).key
+        next_after_id = str(getattr(results[-1], primary_key_attr))
 
     return {
         "count": total_count,
         "limit": limit,
         "offset": offset,
-        "results": session.execute(stmt).scalars().all(),
+        "next_after_id": next_after_id,
+        "results": results,
     }
@@ -1,14 +1,30 @@
 # schemas.py
 from datetime import date as date_type
-from enum import Enum
-from typing import Annotated, Literal, Optional
+from enum import StrEnum
+from typing import Annotated, Any, Generic, Literal, Optional, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import TypedDict
 
+from biokb_ipni.constants import MAX_LIMIT
 
-class OffsetLimit(BaseModel):
-    limit: Annotated[int, Field(le=100)] = 10
-    offset: int = 0
+# type of the primary key, which `after_id` is compared with
+IdT = TypeVar("IdT", int, str)
+
+
+class OffsetLimit(BaseModel, Generic[IdT]):
+    # no `defer_build` here: the search schemas are query parameter models, which
+    # FastAPI builds anyway when the routes are registered
+
+    limit: Annotated[int, Field(ge=1, le=MAX_LIMIT)] = 10
+    offset: Annotated[int, Field(ge=0)] = 0
+    after_id: Optional[IdT] = Field(
+        None,
+        description=(
+            "Return only entries with an ID greater than this one. Pass "
+            "`next_after_id` of the previous page to paginate; faster than `offset`."
+        ),
+    )
 
 
 class CountOffsetLimit(BaseModel):
@@ -16,6 +32,7 @@ class CountOffsetLimit(BaseModel):
     count: int
     offset: int
     limit: int
+    next_after_id: Optional[str] = None
 
 
 # -------------------------------------------------------------------
@@ -28,18 +45,15 @@ class LocationBase(BaseModel):
 
 
 class Location(LocationBase):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     id: int
 
 
-class LocationSearch(OffsetLimit):
+class LocationSearch(LocationBase, OffsetLimit[int]):
     """Fields for searching location records."""
 
     id: Optional[int] = None
-    locality: Optional[str] = None
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
 
 
 class LocationSearchResult(CountOffsetLimit):
@@ -62,24 +76,18 @@ class NameBase(BaseModel):
     family_id: Optional[int] = None
 
 
-class NameWithId(NameBase):
-    model_config = ConfigDict(from_attributes=True)
-
-    id: str
-
-
 class Name(NameBase):
     """Fields returned when reading a Name record from the DB."""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     id: str
     family_name: Optional[str] = None
     reference: Optional["ReferenceWithId"] = None
-    type_materials: list["TypeMaterial"] = []
+    type_materials: list["TypeMaterial"] = Field(default_factory=list)
 
 
-class NameSearch(OffsetLimit):
+class NameSearch(OffsetLimit[str]):
     """Fields for search."""
 
     id: Optional[str] = None
@@ -94,17 +102,20 @@ class NameSearch(OffsetLimit):
     family_id: Optional[int] = None
 
 
-class NameSearchResult(BaseModel):
-    count: int
-    limit: int
-    offset: int
+class NameSearchResult(CountOffsetLimit):
     results: list[Name]
 
 
+class SimilarityMethod(StrEnum):
+    EXACT = "exact"
+    LEVENSHTEIN = "levenshtein"
+    METAPHONE_JARO = "metaphone_jaro"
+    PATTERN_MATCH = "pattern_match"
+    TRIGRAM = "trigram"
+
+
 class NameSearchSimilarNameResult(BaseModel):
-    calculate_with: Optional[
-        Literal["exact", "levenshtein", "metaphone_jaro", "pattern_match"]
-    ] = None
+    calculate_with: Optional[SimilarityMethod] = None
     id: str
     scientific_name: str
     rank: str
@@ -121,22 +132,14 @@ class NameSearchSimilarNameResult(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-# -------------------------------------------------------------------
-# Name Detail
-# -------------------------------------------------------------------
-class NameDetail(BaseModel):
-    """
-    A custom schema to return extended metadata for a given name ID,
-    including scientific name, reference title, family name, and
-    collector/locality from TypeMaterial.
-    """
+class NameRankCount(BaseModel):
+    rank: str
+    count: int
 
-    name_id: str
-    scientific_name: str
-    reference_title: Optional[str] = None
-    family_name: Optional[str] = None
-    collector: Optional[str] = None
-    locality: Optional[str] = None
+
+class NameStatusCount(BaseModel):
+    status: str
+    count: int
 
 
 # -------------------------------------------------------------------
@@ -163,22 +166,22 @@ class ReferenceWithId(ReferenceBase):
     id: str
 
 
-class NameShort(BaseModel):
+class NameShort(TypedDict):
+    """ID and name as built by the `names_short` property of the DB models."""
+
     id: str
     scientific_name: str
 
-    model_config = ConfigDict(from_attributes=True)
-
 
 class Reference(ReferenceBase):
     id: str
     title: str
     names_short: list[NameShort]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
-class ReferenceSearch(ReferenceBase, OffsetLimit):
+class ReferenceSearch(ReferenceBase, OffsetLimit[str]):
     """Fields for searching references."""
 
     id: Optional[str] = None
@@ -201,14 +204,14 @@ class Family(FamilyBase):
     id: str
     name_ids: list[str]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class FamilyWithId(FamilyBase):
     id: Optional[str] = None
 
 
-class FamilySearch(OffsetLimit, FamilyWithId):
+class FamilySearch(OffsetLimit[str], FamilyWithId):
     """Fields for searching family records."""
 
     pass
@@ -221,32 +224,23 @@ class FamilySearchResult(CountOffsetLimit):
 # -------------------------------------------------------------------
 # NameRelation Schemas
 # -------------------------------------------------------------------
-class NameRelationBase(BaseModel):
-    type: str
-    related_name_id: Optional[str] = None
-    name_id: Optional[str] = None
-
-
-class NameRelation(NameRelationBase):
-    model_config = ConfigDict(from_attributes=True)
-
-    id: int
-
-
-class NameRelationType(str, Enum):
-    basionym = "BASIONYM"
-    conserved = "CONSERVED"
-    homotypic = "HOMOTYPIC"
-    later_homonym = "LATER_HOMONYM"
-    replacement_name = "REPLACEMENT_NAME"
-    spelling_correction = "SPELLING_CORRECTION"
-    superfluous = "SUPERFLUOUS"
-    isonymof = "isonymOf"
-    orthographicvariantof = "orthographicVariantOf"
-    validationof = "validationOf"
-
-
-class NameRelationSearch(OffsetLimit):
+# a Literal is validated by a plain string comparison in pydantic-core, an Enum
+# by creating the member in Python
+NameRelationType = Literal[
+    "BASIONYM",
+    "CONSERVED",
+    "HOMOTYPIC",
+    "LATER_HOMONYM",
+    "REPLACEMENT_NAME",
+    "SPELLING_CORRECTION",
+    "SUPERFLUOUS",
+    "isonymOf",
+    "orthographicVariantOf",
+    "validationOf",
+]
+
+
+class NameRelationSearch(OffsetLimit[int]):
     """Fields for searching name relations."""
 
     name: Optional[str] = None
@@ -268,7 +262,6 @@ class NameRelationSimple(BaseModel):
 
 class NameRelationSearchResult(CountOffsetLimit):
     results: list[NameRelationSimple]
-    model_config = ConfigDict(from_attributes=True)
 
 
 # -------------------------------------------------------------------
@@ -286,13 +279,13 @@ class TypeMaterialBase(BaseModel):
 
 
 class TypeMaterial(TypeMaterialBase):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     id: int
     location_id: Optional[int] = None
 
 
-class TypeMaterialSearch(OffsetLimit):
+class TypeMaterialSearch(LocationBase, OffsetLimit[int]):
     """Fields for searching type material records."""
 
     id: Optional[int] = None
@@ -302,12 +295,29 @@ class TypeMaterialSearch(OffsetLimit):
     catalog_number: Optional[str] = None
     collector: Optional[str] = None
     date: Optional[date_type] = None
-    locality: Optional[str] = None
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
     remarks: Optional[str] = None
     name_id: Optional[str] = None
 
 
-class TypeMaterialSearchResult(OffsetLimit):
+class TypeMaterialSearchResult(CountOffsetLimit):
     results: list[TypeMaterial]
+
+
+# -------------------------------------------------------------------
+# Job Schemas
+# -------------------------------------------------------------------
+class Job(BaseModel):
+    """State of a long running database management task."""
+
+    id: str
+    name: str
+    status: Literal["pending", "running", "finished", "failed"] = "pending"
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+
+# resolve the forward references to schemas declared further down once on import
+# instead of on the first validation
+Name.model_rebuild()
+NameSearchResult.model_rebuild()
+NameSearchSimilarNameResult.model_rebuild()
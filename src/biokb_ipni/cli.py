@@ -1,18 +1,18 @@
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
 
 from biokb_ipni import __version__
 from biokb_ipni.constants import DB_DEFAULT_CONNECTION_STR, NEO4J_URI, NEO4J_USER
-from biokb_ipni.db.manager import DbManager
-from biokb_ipni.rdf.neo4j_importer import Neo4jImporter
-from biokb_ipni.rdf.turtle import TurtleCreator
-from biokb_ipni.tools import get_engine
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+# The commands import their dependencies (pandas, SQLAlchemy, rdflib, FastAPI)
+# themselves, so `--help` and `--version` do not load them.
 
 logger = logging.getLogger(__name__)
 
@@ -100,6 +100,9 @@ def import_data(
         delete_files (bool): Delete downloaded source files after import (default: False)
         env (Optional[str]): Environment file to load for configuration (default: None)
     """
+    from biokb_ipni.db.manager import DbManager
+    from biokb_ipni.tools import get_engine
+
     try:
         engine: Engine | None = get_engine(connection_string, env)
     except Exception as e:
@@ -124,7 +127,10 @@ def create_ttls(connection_string: str):
     Args:
         connection_string (str): SQLAlchemy engine URL (default: sqlite:///~/.biokb/biokb.db)
     """
-    path_to_zip = TurtleCreator(create_engine(connection_string)).create_ttls()
+    from biokb_ipni.rdf.turtle import TurtleCreator
+    from biokb_ipni.tools import get_cached_engine
+
+    path_to_zip = TurtleCreator(get_cached_engine(connection_string)).create_ttls()
     click.echo(
         f"Path to the zip file containing all generated Turtle files. {path_to_zip}"
     )
@@ -159,6 +165,8 @@ def import_neo4j(uri: str, user: str, password: Optional[str]):
             "It is not recommended to provide the Neo4j password via command line."
         )
 
+    from biokb_ipni.rdf.neo4j_importer import Neo4jImporter
+
     Neo4jImporter(neo4j_uri=uri, neo4j_user=user, neo4j_pwd=password).import_ttls()
 
 
@@ -169,6 +177,13 @@ def import_neo4j(uri: str, user: str, password: Optional[str]):
 @click.option("--port", "-P", default=8000, help="API server port [default: 8000]")
 @click.option("--user", "-u", default="admin", help="API username [default: admin]")
 @click.option("--password", "-p", default="admin", help="API password [default: admin]")
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of worker processes, e.g. number of CPU cores [default: 1]",
+)
 @click.option(
     "-e",
     "--env",
@@ -177,7 +192,12 @@ def import_neo4j(uri: str, user: str, password: Optional[str]):
     help="Environment file to load for configuration (default: None)",
 )
 def run_server(
-    host: str, port: int, user: str, password: str, env: Optional[str] = None
+    host: str,
+    port: int,
+    user: str,
+    password: str,
+    workers: int,
+    env: Optional[str] = None,
 ) -> None:
     """Run the API server.
 
@@ -186,6 +206,7 @@ def run_server(
         port (int): API server port
         user (str): API username
         password (str): API password
+        workers (int): Number of worker processes
     """
     # load environment file if provided
     if env:
@@ -201,7 +222,7 @@ def run_server(
     click.echo(f"API server running at http://{host_shown}:{port}/docs#/")
     from biokb_ipni.api.main import run_api
 
-    run_api(host=host, port=port)
+    run_api(host=host, port=port, workers=workers)
 
 
 if __name__ == "__main__":
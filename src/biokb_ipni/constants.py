@@ -23,12 +23,14 @@ NEO4J_PASSWORD = "neo4j_password"
 NEO4J_URI = "bolt://localhost:7687"
 NEO4J_USER = "neo4j"
 LOGS_FOLDER = os.path.join(DATA_FOLDER, "logs")  # where to store log files
+JOBS_FOLDER = os.path.join(DATA_FOLDER, "jobs")  # states of the API background jobs
 TABLE_PREFIX = PROJECT_NAME + "_"
 os.makedirs(DATA_FOLDER, exist_ok=True)
 
 # not standard for all biokb projects
 DOWNLOAD_URL = "https://hosted-datasets.gbif.org/datasets/ipni.zip"
 PATH_TO_ZIP_FILE = os.path.join(DATA_FOLDER, "ipni.zip")
+MAX_LIMIT = 100  # upper bound of rows returned by an API search
 
 TAXTREE_DOWNLOAD_URL = (
     "https://ftp.ncbi.nlm.nih.gov/pub/taxonomy/new_taxdump/new_taxdump.zip"
@@ -1,12 +1,17 @@
+import importlib.util
+import json
 import logging
 import os
 import sqlite3
+import uuid
 import zipfile
-from typing import Any, Optional
+from datetime import date as date_type
+from typing import IO, Any, Iterable, Literal, Optional, cast
 
+import jellyfish
 import pandas as pd
 import requests
-from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy import Connection, Date, Engine, Index, event, insert, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 
@@ -25,13 +30,18 @@ from biokb_ipni.constants import (
 from biokb_ipni.db.models import (
     Base,
     Family,
+    ImportInfo,
     Location,
     Name,
     NameRelation,
     Reference,
     TypeMaterial,
 )
-from biokb_ipni.tools import get_cleaned_and_standardized_dataframe, parse_date
+from biokb_ipni.tools import (
+    get_cached_engine,
+    get_cleaned_and_standardized_dataframe,
+    parse_dates,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -40,13 +50,97 @@ logger = logging.getLogger(__name__)
 def set_sqlite_pragma(
     dbapi_connection: sqlite3.Connection, _connection_record: object
 ) -> None:
-    """Enable foreign key constraint for SQLite."""
+    """Enable foreign key constraint and faster journaling and caching for SQLite.
+
+    With the write-ahead log, `synchronous=NORMAL` can lose the last transactions on
+    a power failure, but never corrupts the database.
+    """
     if isinstance(dbapi_connection, sqlite3.Connection):
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA foreign_keys=ON;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA cache_size=-131072;"
+        )
         cursor.close()
 
 
+# pyarrow's multithreaded parser reads the large TSV files several times faster than
+# the C engine of pandas, but is not a required dependency
+CSV_ENGINE: Literal["pyarrow", "c"] = (
+    "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+)
+
+
+def read_tsv(
+    f: IO[bytes],
+    usecols: Optional[list[str]] = None,
+    dtype: Optional[dict[str, str]] = None,
+) -> pd.DataFrame:
+    """Read a TSV file of the IPNI archive with the fastest available parser."""
+    return pd.read_csv(
+        f,
+        sep="\t",
+        engine=CSV_ENGINE,
+        usecols=usecols,
+        dtype=dtype,
+        # only supported by the C engine, which would guess types per chunk
+        low_memory=CSV_ENGINE != "c",
+    )
+
+
+def _download(url: str, path: str) -> None:
+    """Download a file in chunks, unless it is unchanged since the last download.
+
+    The ETag and Last-Modified headers of a download are kept next to the file
+    and sent as conditional request with the next download of the same file.
+    """
+    validators_path = path + ".validators.json"
+    headers = {}
+    if os.path.exists(path) and os.path.exists(validators_path):
+        with open(validators_path) as f:
+            headers = json.load(f)
+    with requests.get(url, headers=headers, stream=True, timeout=60) as response:
+        if response.status_code == 304:
+            logger.info(f"{url} is unchanged, {path} is kept")
+            return
+        if response.status_code != 200:
+            return
+        # written to a temporary file first, an interrupted download must not
+        # leave a truncated file which is taken as complete by the next import
+        with open(path + ".part", "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+        os.replace(path + ".part", path)
+        validators = {
+            "If-None-Match": response.headers.get("ETag"),
+            "If-Modified-Since": response.headers.get("Last-Modified"),
+        }
+    with open(validators_path, "w") as f:
+        json.dump({k: v for k, v in validators.items() if v}, f)
+
+
+def _sqlite_executemany(
+    table: Any, conn: Connection, keys: list[str], data_iter: Iterable[tuple[Any, ...]]
+) -> int:
+    """Insert method for `DataFrame.to_sql` passing all rows to one `executemany`.
+
+    SQLAlchemy renders and binds each batch of rows on its own, the sqlite3 driver
+    inserts all rows with one prepared statement.
+    """
+    columns = ", ".join(f'"{key}"' for key in keys)
+    placeholders = ", ".join("?" * len(keys))
+    # the sqlite3 cursor takes the rows from any iterable, not only from sequences
+    cursor = cast(sqlite3.Cursor, conn.connection.cursor())
+    cursor.executemany(
+        f'INSERT INTO "{table.name}" ({columns}) VALUES ({placeholders})', data_iter
+    )
+    return cursor.rowcount
+
+
 file_table_map: dict[str, Any] = {
     TsvFileName.REFERENCE: Reference,
     TsvFileName.NAME: Name,
@@ -75,7 +169,9 @@ class DbManager:
             force_download (bool): Whether to force download the data.
         """
         connection_str = os.getenv("CONNECTION_STR", DB_DEFAULT_CONNECTION_STR)
-        self.__engine: Engine = engine if engine else create_engine(str(connection_str))
+        self.__engine: Engine = (
+            engine if engine else get_cached_engine(str(connection_str))
+        )
         if self.__engine.dialect.name == "sqlite":
             with self.__engine.connect() as connection:
                 connection.execute(text("pragma foreign_keys=ON"))
@@ -122,18 +218,74 @@ class DbManager:
             Dict[str, int]: table=key and number of inserted=value
         """
         self.recreate_db()
+        # Building an index once from all rows is faster than updating it with
+        # every inserted row, so the indexes are created after the import. Not on
+        # MySQL, which needs an index for every foreign key and refuses to drop it.
+        dropped: list[Index] = []
+        try:
+            if self.__engine.dialect.name in ("sqlite", "postgresql"):
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.drop(self.__engine)
+                        dropped.append(index)
+            if self.__engine.dialect.name == "sqlite":
+                imported = self._import_data_into_sqlite(force_download, delete_files)
+            else:
+                imported = self._import_data(
+                    self.__engine, force_download, delete_files
+                )
+        finally:
+            # a failed import must not leave the tables without their indexes
+            for index in dropped:
+                index.create(self.__engine)
+        if self.__engine.dialect.name == "sqlite":
+            # statistics for the query planner, which SQLite does not collect itself
+            with self.__engine.begin() as connection:
+                connection.exec_driver_sql("ANALYZE")
+        # tells the API workers to drop the data they cached from the last import
+        with self.__engine.begin() as connection:
+            connection.execute(insert(ImportInfo).values(generation=str(uuid.uuid4())))
+        return imported
+
+    def _import_data_into_sqlite(
+        self, force_download: bool, delete_files: bool
+    ) -> dict[str, int]:
+        """Import all data over one connection with deferred foreign key checks.
+
+        SQLite would check the foreign keys of every inserted row, one check of all
+        tables before the commit is faster. Nothing is committed if it fails.
+        """
+        with self.__engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            try:
+                imported = self._import_data(connection, force_download, delete_files)
+                violations = connection.exec_driver_sql(
+                    "PRAGMA foreign_key_check"
+                ).all()
+                if violations:
+                    table, rowid, parent, _ = violations[0]
+                    raise ValueError(
+                        f"{len(violations)} imported rows violate foreign keys, e.g. "
+                        f"row {rowid} of table {table} refers to a missing row of "
+                        f"{parent}"
+                    )
+                connection.commit()
+            finally:
+                # the pragma has no effect within a transaction
+                connection.rollback()
+                connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+        return imported
+
+    def _import_data(
+        self, bind: Engine | Connection, force_download: bool, delete_files: bool
+    ) -> dict[str, int]:
+        """Download the source files if needed and insert their data with `bind`."""
         imported = {}
 
         if force_download or not os.path.exists(PATH_TO_TAXTREE_ZIP_FILE):
             os.makedirs(TAXTREE_DATA_FOLDER, exist_ok=True)
             try:
-                response = requests.get(TAXTREE_DOWNLOAD_URL)
-                if response.status_code == 200:
-                    with open(PATH_TO_TAXTREE_ZIP_FILE, "wb") as f:
-                        f.write(response.content)
-                # urllib.request.urlretrieve(
-                #     TAXTREE_DOWNLOAD_URL, PATH_TO_TAXTREE_ZIP_FILE
-                # )
+                _download(TAXTREE_DOWNLOAD_URL, PATH_TO_TAXTREE_ZIP_FILE)
             except Exception as e:
                 logger.error(f"Failed to download {TAXTREE_DOWNLOAD_URL}: {e}")
                 raise
@@ -162,10 +314,7 @@ class DbManager:
         if force_download or not os.path.exists(self.path_to_zip_file):
             os.makedirs(DATA_FOLDER, exist_ok=True)
             try:
-                response = requests.get(DOWNLOAD_URL)
-                if response.status_code == 200:
-                    with open(self.path_to_zip_file, "wb") as f:
-                        f.write(response.content)
+                _download(DOWNLOAD_URL, self.path_to_zip_file)
             except Exception as e:
                 logger.error(f"Failed to download {DOWNLOAD_URL}: {e}")
                 raise
@@ -176,9 +325,7 @@ class DbManager:
         # -----------------------------------------------------------------------------
         logger.info("Importing references")
         df_reference = self.get_dataframe(TsvFileName.REFERENCE, Reference)
-        df_reference.to_sql(
-            Reference.__tablename__, self.__engine, if_exists="append", index=False
-        )
+        self._to_sql(bind, df_reference, Reference)
         imported[Reference.__tablename__] = len(df_reference)
         df_reference = None  # free memory
 
@@ -189,11 +336,7 @@ class DbManager:
         with zipfile.ZipFile(self.path_to_zip_file, "r") as z:
             with z.open("Taxon.tsv") as f:
                 df_nameid_family = (
-                    pd.read_csv(
-                        f,
-                        sep="\t",
-                        usecols=["col:family", "col:nameID"],
-                    )
+                    read_tsv(f, usecols=["col:family", "col:nameID"])
                     .dropna()
                     .drop_duplicates()
                     .rename(columns={"col:family": "family", "col:nameID": "id"})
@@ -213,9 +356,7 @@ class DbManager:
             .rename_axis("id")
             .rename(index=lambda i: i + 1)
         )
-        df_family.to_sql(
-            Family.__tablename__, self.__engine, if_exists="append", index=True
-        )
+        self._to_sql(bind, df_family, Family, index=True)
         imported[Family.__tablename__] = len(df_family)
         # -----------------------------------------------------------------------------
         # Name
@@ -244,9 +385,10 @@ class DbManager:
         ).drop(columns=["tax_name"])
         df_name["family_id"] = df_name["family_id"].astype("Int64")  # allow nulls
         df_name["tax_id"] = df_name["tax_id"].astype("Int64")  # allow nulls
-        df_name.to_sql(
-            Name.__tablename__, self.__engine, if_exists="append", index=False
-        )
+        # keys used by the fuzzy name search, computed once at import time
+        df_name["scientific_name_lc"] = df_name["scientific_name"].str.lower()
+        df_name["metaphone"] = df_name["scientific_name"].map(jellyfish.metaphone)
+        self._to_sql(bind, df_name, Name)
         imported[Name.__tablename__] = len(df_name)
         df_name = None  # free memory
 
@@ -262,9 +404,7 @@ class DbManager:
             .rename_axis("id")
             .rename(index=lambda i: i + 1)
         )
-        df_location.to_sql(
-            Location.__tablename__, self.__engine, if_exists="append", index=True
-        )
+        self._to_sql(bind, df_location, Location, index=True)
         df_location["location_id"] = df_location.index  # add location_id for merging
         df_type_material = df_type_material.merge(
             df_location,
@@ -274,9 +414,7 @@ class DbManager:
             columns=["locality", "latitude", "longitude"]
         )  # drop columns after merging
         df_location = None  # free memory
-        df_type_material.to_sql(
-            TypeMaterial.__tablename__, self.__engine, if_exists="append", index=False
-        )
+        self._to_sql(bind, df_type_material, TypeMaterial)
         imported[TypeMaterial.__tablename__] = len(df_type_material)
         df_type_material = None  # free memory
         # -----------------------------------------------------------------------------
@@ -284,9 +422,7 @@ class DbManager:
         # -----------------------------------------------------------------------------
         logger.info("Importing name relations")
         df_name_relation = self.get_dataframe(TsvFileName.NAMES_RELATION, NameRelation)
-        df_name_relation.to_sql(
-            NameRelation.__tablename__, self.__engine, if_exists="append", index=False
-        )
+        self._to_sql(bind, df_name_relation, NameRelation)
         imported[NameRelation.__tablename__] = len(df_name_relation)
         df_name_relation = None  # free memory
 
@@ -295,18 +431,46 @@ class DbManager:
 
         return imported
 
+    def _to_sql(
+        self,
+        bind: Engine | Connection,
+        df: pd.DataFrame,
+        model: type[Base],
+        index: bool = False,
+    ) -> None:
+        """Append the rows of a DataFrame to the table of a model."""
+        method = None
+        if self.__engine.dialect.name == "sqlite":
+            method = _sqlite_executemany
+            # without SQLAlchemy's Date type the sqlite3 driver would bind dates by
+            # its default adapter, deprecated since Python 3.12, so they are passed
+            # in the ISO format the Date type stores
+            df = df.assign(
+                **{
+                    column.name: df[column.name].map(
+                        date_type.isoformat, na_action="ignore"
+                    )
+                    for column in model.__table__.columns
+                    if isinstance(column.type, Date) and column.name in df
+                }
+            )
+        df.to_sql(
+            model.__tablename__,
+            bind,
+            if_exists="append",
+            index=index,
+            method=method,
+        )
+
     def get_dataframe(self, tsv_file: str, model) -> pd.DataFrame:
         with zipfile.ZipFile(self.path_to_zip_file, "r") as z:
             with z.open(tsv_file) as f:
-                df: pd.DataFrame = pd.read_csv(
-                    f,
-                    sep="\t",
-                    low_memory=False,
-                )
+                # dates are parsed below, pyarrow would convert some of them itself
+                dtype = {"col:date": "str"} if model == TypeMaterial else None
+                df: pd.DataFrame = read_tsv(f, dtype=dtype)
         if model == TypeMaterial:
             df.drop(columns=["col:ID"], inplace=True)
-            df["col:remarks"] = df["col:remarks"].replace(float("nan"), None)
-            df["col:date"] = df["col:date"].map(parse_date)  # type: ignore
+            df["col:date"] = parse_dates(df["col:date"])
 
         df = get_cleaned_and_standardized_dataframe(df)
 
@@ -315,15 +479,12 @@ class DbManager:
             # have a corresponding entry in the Name table.
             with zipfile.ZipFile(self.path_to_zip_file, "r") as z:
                 with z.open(TsvFileName.NAME) as f:
-                    df_name_id = pd.read_csv(
-                        f,
-                        sep="\t",
-                        usecols=["col:ID"],
-                    ).rename(columns={"col:ID": "name_id"})
-            df = df[
-                df.related_name_id.isin(df_name_id.name_id)
-                & df.name_id.isin(df_name_id.name_id)
-            ]
+                    name_ids = pd.Index(read_tsv(f, usecols=["col:ID"])["col:ID"])
+            # the hash table of the (unique) name IDs is built once and reused for
+            # both columns, `isin` would build it for every call
+            mask = name_ids.get_indexer(pd.Index(df.related_name_id, copy=False)) >= 0
+            mask &= name_ids.get_indexer(pd.Index(df.name_id, copy=False)) >= 0
+            df = df[mask]
         if not df.empty:
             return df
         else:
@@ -3,8 +3,10 @@
 from datetime import date as date_type
 from typing import Any, Optional
 
-from sqlalchemy import Date, ForeignKey, String, Text
+import jellyfish
+from sqlalchemy import DDL, Date, ForeignKey, Index, String, Text, event, text
 from sqlalchemy.dialects.mysql import VARCHAR
+from sqlalchemy.engine.default import DefaultExecutionContext
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from biokb_ipni.constants import PROJECT_NAME
@@ -14,6 +16,14 @@ class Base(DeclarativeBase):
     _prefix = PROJECT_NAME + "_"
 
 
+# trigram similarity (used by the fuzzy name search) is only available on PostgreSQL
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class Location(Base):
     """Location model representing geographical locations in the database.
 
@@ -42,6 +52,15 @@ class Location(Base):
     )
 
 
+def _lowercase_scientific_name(context: DefaultExecutionContext) -> str:
+    scientific_name: str = context.get_current_parameters()["scientific_name"]
+    return scientific_name.lower()
+
+
+def _metaphone_of_scientific_name(context: DefaultExecutionContext) -> str:
+    return jellyfish.metaphone(context.get_current_parameters()["scientific_name"])
+
+
 class Name(Base):
     """Name model representing a scientific name in the database.
 
@@ -57,6 +76,8 @@ class Name(Base):
         reference_id (Optional[str]): Foreign key to the associated reference.
         family_id (Optional[int]): Foreign key to the family.
         tax_id (Optional[int]): NCBI Taxon ID associated with the name.
+        scientific_name_lc (Optional[str]): Lowercase scientific name.
+        metaphone (Optional[str]): Metaphone key of the scientific name.
         family (Family): Relationship to the associated family.
         reference (Reference): Relationship to the associated reference.
         type_materials (list[TypeMaterial]): Relationship to associated type materials.
@@ -65,6 +86,29 @@ class Name(Base):
     """
 
     __tablename__ = Base._prefix + "name"
+    __table_args__ = (
+        Index(
+            "ix_" + Base._prefix + "name_scientific_name_trgm",
+            "scientific_name",
+            # GiST (unlike GIN) returns the nearest names by trigram distance
+            postgresql_using="gist",
+            postgresql_ops={"scientific_name": "gist_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_" + Base._prefix + "name_scientific_name_tsv",
+            text("to_tsvector('simple', scientific_name)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        # covers the name IDs of a family, no table rows have to be read
+        Index("ix_" + Base._prefix + "name_family_id", "family_id", "id"),
+        # prefix LIKE of the fuzzy name search can only use a b-tree index with
+        # pattern ops on PostgreSQL, unless the database uses the C collation
+        Index(
+            "ix_" + Base._prefix + "name_scientific_name_lc_pattern",
+            "scientific_name_lc",
+            postgresql_ops={"scientific_name_lc": "varchar_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(255), primary_key=True, comment="Primary key identifier for the name"
@@ -107,6 +151,19 @@ class Name(Base):
     tax_id: Mapped[Optional[int]] = mapped_column(
         comment="NCBI Taxon ID associated with the name"
     )
+    # keys of the fuzzy name search, filled on insert if not given
+    scientific_name_lc: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        index=True,
+        default=_lowercase_scientific_name,
+        comment="Lowercase scientific name",
+    )
+    metaphone: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        index=True,
+        default=_metaphone_of_scientific_name,
+        comment="Metaphone key of the scientific name",
+    )
 
     # relationships
     family: Mapped[Optional["Family"]] = relationship(back_populates="names")
@@ -363,3 +420,20 @@ class TypeMaterial(Base):
 
     def __repr__(self) -> str:
         return f"<TypeMaterial:id={self.id!r}, status={self.status!r}, institution_code={self.institution_code!r}>"
+
+
+class ImportInfo(Base):
+    """ImportInfo model holding one row written by every successful import.
+
+    Attributes:
+        id (int): Primary key identifier.
+        generation (str): Random ID of the import, with which the API workers
+            detect that the data changed and drop their caches.
+    """
+
+    __tablename__ = Base._prefix + "import_info"
+
+    id: Mapped[int] = mapped_column(autoincrement=True, primary_key=True)
+    generation: Mapped[str] = mapped_column(
+        String(36), comment="Random ID of the import"
+    )
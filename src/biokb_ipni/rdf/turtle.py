@@ -5,7 +5,7 @@ import shutil
 from typing import List, Optional, TypeVar
 
 from rdflib import RDF, XSD, Graph, Literal, Namespace, URIRef
-from sqlalchemy import Engine, and_, create_engine, or_, select, text
+from sqlalchemy import Engine, and_, or_, select, text
 from sqlalchemy.orm import sessionmaker
 from tqdm import tqdm
 
@@ -13,10 +13,14 @@ from biokb_ipni import constants
 from biokb_ipni.constants import BASIC_NODE_LABEL, EXPORT_FOLDER
 from biokb_ipni.db import models
 from biokb_ipni.rdf import namespaces
+from biokb_ipni.tools import get_cached_engine
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+UPPER_SNAKE_CASE_PATTERN = re.compile(r"^[A-Z_]+$")
+UPPER_CASE_LETTER_PATTERN = re.compile(r"([A-Z])")
+
 
 # Type variable for SQLAlchemy model classes
 BaseModels = TypeVar("BaseModels", bound=models.Base)
@@ -60,7 +64,7 @@ class TurtleCreator:
         connection_str = os.getenv(
             "CONNECTION_STR", constants.DB_DEFAULT_CONNECTION_STR
         )
-        self.__engine = engine if engine else create_engine(str(connection_str))
+        self.__engine = engine if engine else get_cached_engine(str(connection_str))
         self.Session = sessionmaker(bind=self.__engine)
 
     def _set_ttls_folder(self, export_to_folder: str) -> None:
@@ -234,11 +238,13 @@ class TurtleCreator:
                 ]
                 object_entity: URIRef = namespaces.NAME_NS[str(relation.name_id)]
 
-                if re.search(r"^[A-Z_]+$", relation.type):
+                if UPPER_SNAKE_CASE_PATTERN.search(relation.type):
                     relation_name_suffix = relation.type
                 else:
                     relation_name_suffix = (
-                        re.sub(r"([A-Z])", r"_\1", relation.type).strip("_").upper()
+                        UPPER_CASE_LETTER_PATTERN.sub(r"_\1", relation.type)
+                        .strip("_")
+                        .upper()
                     )
                 graph.add(
                     triple=(
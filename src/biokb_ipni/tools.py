@@ -2,6 +2,7 @@ import datetime
 import logging
 import os
 import re
+from functools import lru_cache
 from typing import Any, Iterable, Optional
 
 import pandas as pd
@@ -14,6 +15,24 @@ from biokb_ipni.constants import DB_DEFAULT_CONNECTION_STR
 
 logger = logging.getLogger(__name__)
 
+# applied to millions of cells and dates during import, so compiled only once
+MULTIPLE_WHITESPACES_PATTERN = re.compile(r"\s{2,}")
+# all characters `\s` and `str.strip` treat as whitespace, listed explicitly because
+# the regular expressions of pyarrow's string functions (RE2) know fewer of them
+WHITESPACES = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003"
+    "\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+MULTIPLE_WHITESPACES_REGEX = f"[{WHITESPACES}]{{2,}}"
+COLUMN_NAME_WORD_PATTERN = re.compile(r"[A-Za-z][a-z]*")
+DATE_PATTERN = re.compile(r"^(?P<year>\d{2,4})-(?P<month>\d{1,2})(-(?P<day>\d{1,2}))?")
+
+
+@lru_cache
+def get_cached_engine(connection_string: str) -> Engine:
+    """Create the engine for a connection string once and reuse its pool."""
+    return create_engine(connection_string, pool_pre_ping=True)
+
 
 def get_engine(
     connection_string: Optional[str], env: Optional[str] = None
@@ -105,7 +124,7 @@ def get_standard_column_name(column_name: str) -> str:
         str: standardized column name
     """
     without_prefix = column_name.split(":")[-1].strip().replace("ID", "Id")
-    results = re.findall(r"[A-Za-z][a-z]*", without_prefix)
+    results = COLUMN_NAME_WORD_PATTERN.findall(without_prefix)
     return "_".join(results).lower()
 
 
@@ -131,7 +150,7 @@ def clean_if_string(input: str | Any) -> str | Any:
         str | Any: string to clean of Any
     """
     if isinstance(input, str):
-        return re.sub(r"\s{2,}", " ", input).strip()
+        return MULTIPLE_WHITESPACES_PATTERN.sub(" ", input).strip()
     return input
 
 
@@ -149,7 +168,22 @@ def get_cleaned_and_standardized_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: cleaned and standardized DataFrame
     """
     df.columns = get_standard_column_names(df.columns)
-    df_new = df.map(lambda x: clean_if_string(x))
+    df_new = df.copy()
+    # only text columns can contain strings, numeric columns are not visited
+    for column in df_new.select_dtypes(include=["object", "string"]).columns:
+        # pandas < 3 reads text as object columns, which are vectorized as well as
+        # long as they only contain strings (missing values are skipped)
+        if isinstance(df_new[column].dtype, pd.StringDtype) or (
+            pd.api.types.infer_dtype(df_new[column], skipna=True) == "string"
+        ):
+            # same result as `clean_if_string`, but vectorized
+            df_new[column] = (
+                df_new[column]
+                .str.replace(MULTIPLE_WHITESPACES_REGEX, " ", regex=True)
+                .str.strip(WHITESPACES)
+            )
+        else:
+            df_new[column] = df_new[column].map(clean_if_string)
     df_new.drop_duplicates(inplace=True)
     return df_new
 
@@ -158,9 +192,7 @@ def parse_date(date):
     if pd.isna(date):  # Handle NaN values
         return pd.NaT
     else:
-        found = re.search(
-            r"^(?P<year>\d{2,4})-(?P<month>\d{1,2})(-(?P<day>\d{1,2}))?", date
-        )
+        found = DATE_PATTERN.search(date)
         if found:
             year = int(found["year"])
             month = int(found["month"])
@@ -169,3 +201,23 @@ def parse_date(date):
             return datetime.date(year, month, day)
         else:
             return pd.NaT  # If format is unknown
+
+
+def parse_dates(dates: pd.Series) -> pd.Series:
+    """Apply `parse_date` to a whole column.
+
+    Complete dates are converted by pandas in one vectorized pass. Only the other
+    values (partial dates, 29th of February, unknown formats) are passed to
+    `parse_date`, once per distinct value.
+    """
+    parsed = pd.to_datetime(dates, format="%Y-%m-%d", errors="coerce")
+    result = parsed.dt.date
+    rest = dates.notna() & (
+        parsed.isna() | ((parsed.dt.month == 2) & (parsed.dt.day == 29))
+    )
+    if rest.any():
+        unique_dates = dates[rest].unique()
+        result[rest] = dates[rest].map(
+            dict(zip(unique_dates, map(parse_date, unique_dates)))
+        )
+    return result
@@ -0,0 +1,73 @@
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from biokb_ipni.api import main
+from biokb_ipni.db import models
+
+NAMES = [
+    ("Achillea millefolium", "L."),
+    ("Achillea millefolia", "Kit."),
+    ("Aloe vera", "(L.) Burm.f."),
+    ("Aloe ferox", "Mill."),
+    ("Phaseolus vulgaris", "L."),
+]
+
+
+@pytest.fixture()
+def session_factory() -> sessionmaker[Session]:
+    """In-memory SQLite database with a few names, locations and relations."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as session:
+        session.add(models.Family(id="1", family="Asteraceae", tax_id=4210))
+        session.add(models.Reference(id="r1", title="Species Plantarum"))
+        for i, (scientific_name, authorship) in enumerate(NAMES):
+            session.add(
+                models.Name(
+                    id=f"{i}-1",
+                    rank="spec.",
+                    scientific_name=scientific_name,
+                    authorship=authorship,
+                    status="ok",
+                    family_id="1" if i < 2 else None,
+                    reference_id="r1" if i == 0 else None,
+                )
+            )
+        for i in range(1, 4):
+            session.add(
+                models.NameRelation(
+                    type="BASIONYM", name_id="0-1", related_name_id=f"{i}-1"
+                )
+            )
+            session.add(models.Location(locality=f"Locality {i}"))
+        session.commit()
+    return factory
+
+
+@pytest.fixture()
+def client(
+    session_factory: sessionmaker[Session], monkeypatch
+) -> Generator[TestClient, None, None]:
+    def get_session() -> Generator[Session, None, None]:
+        with session_factory() as session:
+            yield session
+
+    # the caches are module level, so entries of other tests must not be served
+    main._clear_lookup_cache()
+    monkeypatch.setattr(main, "_import_generation", None)
+    previous = main.app.dependency_overrides.get(main.get_session)
+    main.app.dependency_overrides[main.get_session] = get_session
+    yield TestClient(main.app)
+    if previous:
+        main.app.dependency_overrides[main.get_session] = previous
+    else:
+        del main.app.dependency_overrides[main.get_session]
+    main._clear_lookup_cache()
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+
+from biokb_ipni.api import main
+from biokb_ipni.db import models
+
+
+def rename_family(session_factory: sessionmaker[Session], reimported: bool) -> None:
+    """Change the data, with the generation written by the import of any worker."""
+    with session_factory() as session:
+        session.execute(update(models.Family).values(family="Compositae"))
+        if reimported:
+            session.add(models.ImportInfo(generation="new"))
+        session.commit()
+
+
+def test_by_id_cache_dropped_after_import(
+    client: TestClient, session_factory: sessionmaker[Session], monkeypatch
+):
+    assert client.get("/family/by_id/?id=1").json()["family"] == "Asteraceae"
+    monkeypatch.setattr(main, "_import_checked_at", float("-inf"))
+    rename_family(session_factory, reimported=False)
+    # served from the cache, as the data was not imported again
+    assert client.get("/family/by_id/?id=1").json()["family"] == "Asteraceae"
+    rename_family(session_factory, reimported=True)
+    # within the check interval the cache is still used
+    assert client.get("/family/by_id/?id=1").json()["family"] == "Asteraceae"
+    monkeypatch.setattr(main, "_import_checked_at", float("-inf"))
+    assert client.get("/family/by_id/?id=1").json()["family"] == "Compositae"
+
+
+def test_lookup_cache_dropped_after_import(
+    client: TestClient, session_factory: sessionmaker[Session], monkeypatch
+):
+    assert client.get("/families/").json()[0]["family"] == "Asteraceae"
+    rename_family(session_factory, reimported=True)
+    monkeypatch.setattr(main, "_import_checked_at", float("-inf"))
+    assert client.get("/families/").json()[0]["family"] == "Compositae"
+
+
+def test_similar_names_cache_dropped_after_import(
+    client: TestClient, session_factory: sessionmaker[Session], monkeypatch
+):
+    def find_similar() -> list[str]:
+        params = {"search_for_name": "Aloe vera"}
+        response = client.get("/names/find_similar", params=params)
+        return [result["id"] for result in response.json()]
+
+    assert find_similar() == ["2-1"]
+    with session_factory() as session:
+        session.add(
+            models.Name(
+                id="5-1", rank="spec.", scientific_name="Aloe vera", status="ok"
+            )
+        )
+        session.add(models.ImportInfo(generation="new"))
+        session.commit()
+    assert find_similar() == ["2-1"]
+    monkeypatch.setattr(main, "_import_checked_at", float("-inf"))
+    assert sorted(find_similar()) == ["2-1", "5-1"]
@@ -0,0 +1,76 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from biokb_ipni.db import models
+
+
+def find_similar(client: TestClient, name: str) -> list[tuple[str, str, float]]:
+    response = client.get("/names/find_similar", params={"search_for_name": name})
+    assert response.status_code == 200
+    return [
+        (entry["scientific_name"], entry["calculate_with"], entry["similarity"])
+        for entry in response.json()
+    ]
+
+
+def test_find_similar_exact(client: TestClient) -> None:
+    assert find_similar(client, "Achillea  millefolium") == [
+        ("Achillea millefolium", "exact", 1.0)
+    ]
+
+
+def test_find_similar_exact_with_authorship(
+    client: TestClient, session_factory: sessionmaker[Session]
+) -> None:
+    # names without authorship must not hide the exact match
+    with session_factory() as session:
+        for i, scientific_name in ((5, "Aloe vera"), (6, "Aloe verae")):
+            session.add(
+                models.Name(
+                    id=f"{i}-1",
+                    rank="spec.",
+                    status="ok",
+                    scientific_name=scientific_name,
+                )
+            )
+        session.commit()
+    response = client.get(
+        "/names/find_similar", params={"search_for_name": "Aloe vera (L.) Burm.f."}
+    )
+    assert [(entry["id"], entry["calculate_with"]) for entry in response.json()] == [
+        ("2-1", "exact")
+    ]
+
+
+def test_find_similar_metaphone_jaro(client: TestClient) -> None:
+    assert find_similar(client, "Achillea millefolum") == [
+        ("Achillea millefolium", "metaphone_jaro", 0.99),
+        ("Achillea millefolia", "metaphone_jaro", 0.96),
+    ]
+
+
+def test_find_similar_pattern_match(client: TestClient) -> None:
+    # shares the prefixes, but neither the Metaphone key nor enough letters
+    assert find_similar(client, "Phzseqqqq vuzzaris") == [
+        ("Phaseolus vulgaris", "pattern_match", 0.61)
+    ]
+
+
+def test_find_similar_levenshtein(client: TestClient) -> None:
+    # no name shares the prefix of the second word, at most 3 are returned
+    assert find_similar(client, "Aloe xxrox") == [
+        ("Aloe ferox", "levenshtein", 0.8),
+        ("Aloe vera", "levenshtein", 0.63),
+        ("Achillea millefolia", "levenshtein", 0.34),
+    ]
+
+
+def test_find_similar_not_found(client: TestClient) -> None:
+    response = client.get("/names/find_similar", params={"search_for_name": "Xyz abc"})
+    assert response.status_code == 404
+
+
+def test_find_similar_too_short(client: TestClient) -> None:
+    # passes the length check of the query parameter, but not after normalization
+    response = client.get("/names/find_similar", params={"search_for_name": "  a"})
+    assert response.status_code == 422
@@ -0,0 +1,129 @@
+import asyncio
+import subprocess
+import sys
+from typing import Any
+from unittest import mock
+
+import pytest
+from fastapi import BackgroundTasks
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from biokb_ipni.api import jobs, main
+
+AUTH = (main.USERNAME, main.PASSWORD)
+
+
+@pytest.fixture(autouse=True)
+def jobs_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture()
+def app_state(monkeypatch, session_factory: sessionmaker[Session]) -> None:
+    # set by the lifespan, which the TestClient only runs as context manager
+    monkeypatch.setattr(main.app.state, "engine", None, raising=False)
+    monkeypatch.setattr(main.app.state, "session_factory", session_factory, False)
+
+
+def fake_db_manager(result: Any) -> type:
+    class FakeDbManager:
+        def __init__(self, engine):
+            pass
+
+        def import_data(self, force_download: bool, delete_files: bool):
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+    return FakeDbManager
+
+
+def test_import_data_job(client: TestClient, app_state, monkeypatch):
+    monkeypatch.setattr(main.manager, "DbManager", fake_db_manager({"ipni_name": 5}))
+    response = client.post("/import_data/", auth=AUTH)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["name"] == "import_data"
+    assert job["status"] == "pending"
+    # the TestClient runs the background task before it returns the response
+    response = client.get(f"/jobs/{job['id']}", auth=AUTH)
+    assert response.status_code == 200
+    assert response.json()["status"] == "finished"
+    assert response.json()["result"] == {"ipni_name": 5}
+
+
+def test_import_data_job_failed(client: TestClient, app_state, monkeypatch):
+    monkeypatch.setattr(main.manager, "DbManager", fake_db_manager(ValueError("no")))
+    job = client.post("/import_data/", auth=AUTH).json()
+    job = client.get(f"/jobs/{job['id']}", auth=AUTH).json()
+    assert job["status"] == "failed"
+    assert job["error"] == "no"
+
+
+@pytest.mark.parametrize(
+    "job_id", ["9f6b1c8e-6d1a-4f0e-9a53-0d1c2b3a4f5e", "not-a-uuid"]
+)
+def test_get_job_not_found(client: TestClient, job_id: str):
+    assert client.get(f"/jobs/{job_id}", auth=AUTH).status_code == 404
+
+
+def test_start_job_in_progress():
+    background_tasks = BackgroundTasks()
+    job = jobs.start_job(background_tasks, "export_ttls", lambda: 1)
+    assert jobs.start_job(BackgroundTasks(), "export_ttls", lambda: 2) == job
+    # other names are not blocked
+    assert jobs.start_job(BackgroundTasks(), "import_neo4j", lambda: 3) != job
+    asyncio.run(background_tasks())
+    assert jobs.get_job(job.id).result == 1
+    new_job = jobs.start_job(BackgroundTasks(), "export_ttls", lambda: 2)
+    assert new_job.id != job.id
+
+
+def test_start_job_interrupted():
+    background_tasks = BackgroundTasks()
+    job = jobs.start_job(background_tasks, "export_ttls", lambda: 1)
+    # the lock is released as by a worker which died before the job was done
+    background_tasks.tasks[0].args[2].close()
+    new_job = jobs.start_job(BackgroundTasks(), "export_ttls", lambda: 2)
+    assert new_job.id != job.id
+    assert jobs.get_job(job.id).status == "failed"
+
+
+HOLD_JOB = """
+import sys
+from fastapi import BackgroundTasks
+from biokb_ipni.api import jobs
+jobs.JOBS_FOLDER = sys.argv[1]
+# the lock file is closed with the background tasks, which are never run here
+background_tasks = BackgroundTasks()
+print(jobs.start_job(background_tasks, sys.argv[2], lambda: None).id, flush=True)
+sys.stdin.read()
+"""
+
+
+@pytest.mark.parametrize("path", ["/export_ttls/", "/import_neo4j/"])
+def test_job_in_progress_in_other_worker(
+    client: TestClient, app_state, jobs_folder, monkeypatch, tmp_path_factory, path
+):
+    zipped_ttls = tmp_path_factory.mktemp("ttls") / "ttls.zip"
+    zipped_ttls.touch()
+    monkeypatch.setattr(main, "ZIPPED_TTLS_PATH", str(zipped_ttls))
+    monkeypatch.setattr(main, "Neo4jImporter", mock.MagicMock())
+    name = path.strip("/")
+    # another worker process, which holds the job until its stdin is closed
+    worker = subprocess.Popen(
+        [sys.executable, "-c", HOLD_JOB, str(jobs_folder), name],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        job_id = worker.stdout.readline().strip()
+        assert client.get(path, auth=AUTH).json()["id"] == job_id
+    finally:
+        worker.communicate()
+    # the worker exited while the job was pending
+    assert client.get(path, auth=AUTH).json()["id"] != job_id
+    assert jobs.get_job(job_id).status == "failed"
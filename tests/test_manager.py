@@ -0,0 +1,138 @@
+import datetime
+import warnings
+
+import pandas as pd
+import pytest
+from sqlalchemy import (
+    Connection,
+    Engine,
+    Index,
+    create_engine,
+    func,
+    inspect,
+    select,
+)
+
+from biokb_ipni.db import models
+from biokb_ipni.db.manager import DbManager
+
+
+@pytest.fixture()
+def engine(tmp_path) -> Engine:
+    return create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+
+
+def insert_names(connection: Connection, reference_id: str) -> dict[str, int]:
+    connection.execute(
+        models.Reference.__table__.insert(),
+        [{"id": "r1", "title": "Species Plantarum"}],
+    )
+    connection.execute(
+        models.Name.__table__.insert(),
+        [
+            {
+                "id": "1-1",
+                "rank": "spec.",
+                "scientific_name": "Aloe vera",
+                "status": "ok",
+                "reference_id": reference_id,
+            }
+        ],
+    )
+    return {models.Name.__tablename__: 1}
+
+
+def count_names(engine: Engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(
+            select(func.count()).select_from(models.Name)
+        ).scalar_one()
+
+
+def index_names(engine: Engine) -> set[str]:
+    inspector = inspect(engine)
+    return {
+        index["name"]
+        for table in inspector.get_table_names()
+        for index in inspector.get_indexes(table)
+    }
+
+
+def test_import_data_into_sqlite(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        DbManager, "_import_data", lambda self, bind, *_: insert_names(bind, "r1")
+    )
+    assert DbManager(engine).import_data() == {models.Name.__tablename__: 1}
+    assert count_names(engine) == 1
+    assert "ix_ipni_name_metaphone" in index_names(engine)
+
+
+def test_import_data_writes_new_generation(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        DbManager, "_import_data", lambda self, bind, *_: insert_names(bind, "r1")
+    )
+    generations = []
+    for _ in range(2):
+        DbManager(engine).import_data()
+        with engine.connect() as connection:
+            generations += connection.scalars(select(models.ImportInfo.generation))
+    assert len(generations) == 2
+    assert generations[0] != generations[1]
+
+
+def test_import_data_into_sqlite_rolls_back_foreign_key_violations(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        DbManager, "_import_data", lambda self, bind, *_: insert_names(bind, "r2")
+    )
+    with pytest.raises(ValueError, match="violate foreign keys"):
+        DbManager(engine).import_data()
+    assert count_names(engine) == 0
+    assert "ix_ipni_name_metaphone" in index_names(engine)
+
+
+def test_import_data_recreates_indexes_if_dropping_fails(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    drop = Index.drop
+    dropped = []
+
+    def drop_two(index: Index, bind: Engine) -> None:
+        if len(dropped) == 2:
+            raise RuntimeError("drop failed")
+        drop(index, bind)
+        dropped.append(index.name)
+
+    monkeypatch.setattr(Index, "drop", drop_two)
+    DbManager(engine).recreate_db()
+    indexes = index_names(engine)
+    with pytest.raises(RuntimeError, match="drop failed"):
+        DbManager(engine).import_data()
+    # the error of the drop is raised, not one of recreating the other indexes
+    assert len(dropped) == 2
+    assert index_names(engine) == indexes
+
+
+def test_to_sql_sqlite_binds_dates_as_iso_strings(engine: Engine) -> None:
+    db_manager = DbManager(engine)
+    db_manager.recreate_db()
+    with engine.begin() as connection:
+        insert_names(connection, "r1")
+    df = pd.DataFrame(
+        {"name_id": ["1-1", "1-1"], "date": [datetime.date(1753, 5, 1), pd.NaT]}
+    )
+    with warnings.catch_warnings():
+        # the default date adapter of sqlite3 warns since Python 3.12
+        warnings.simplefilter("error", DeprecationWarning)
+        with engine.begin() as connection:
+            db_manager._to_sql(connection, df, models.TypeMaterial)
+    with engine.connect() as connection:
+        stored = connection.execute(
+            select(models.TypeMaterial.__table__.c.date).order_by("id")
+        ).scalars()
+        assert list(stored) == [datetime.date(1753, 5, 1), None]
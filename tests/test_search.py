@@ -0,0 +1,63 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from biokb_ipni.constants import MAX_LIMIT
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"limit": 0}, {"limit": -1}, {"limit": MAX_LIMIT + 1}, {"offset": -5}],
+)
+def test_search_rejects_out_of_range_limit_and_offset(
+    client: TestClient, params: dict[str, int]
+) -> None:
+    for path in ("/names/search/", "/locations/search/", "/name_relations/search/"):
+        assert client.get(path, params=params).status_code == 422
+
+
+def test_search_limit_and_offset(client: TestClient) -> None:
+    response = client.get("/names/search/", params={"limit": 2, "offset": 1})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 5
+    assert data["limit"] == 2
+    assert [name["id"] for name in data["results"]] == ["1-1", "2-1"]
+
+
+@pytest.mark.parametrize(
+    "path, ids",
+    [
+        ("/names/search/", ["0-1", "1-1", "2-1", "3-1", "4-1"]),
+        ("/locations/search/", [1, 2, 3]),
+        ("/name_relations/search/", ["1-1", "2-1", "3-1"]),
+    ],
+)
+def test_search_keyset_pagination(client: TestClient, path: str, ids: list) -> None:
+    key = "related_name_id" if path == "/name_relations/search/" else "id"
+    found = []
+    params: dict = {"limit": 2}
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == len(ids)
+        found += [entry[key] for entry in data["results"]]
+        if data["next_after_id"] is None:
+            break
+        params["after_id"] = data["next_after_id"]
+    assert found == ids
+
+
+def test_search_next_after_id_only_for_full_pages(client: TestClient) -> None:
+    data = client.get("/locations/search/", params={"limit": 3}).json()
+    assert data["next_after_id"] == "3"
+    data = client.get("/locations/search/", params={"after_id": 3}).json()
+    assert data["results"] == []
+    assert data["next_after_id"] is None
+
+
+@pytest.mark.parametrize(
+    "path", ["/locations/search/", "/name_relations/search/", "/type_materials/search/"]
+)
+def test_search_rejects_after_id_of_wrong_type(client: TestClient, path: str) -> None:
+    assert client.get(path, params={"after_id": "abc"}).status_code == 422
@@ -5,6 +5,8 @@ from biokb_ipni.tools import (
     get_cleaned_and_standardized_dataframe,
     get_standard_column_name,
     get_standard_column_names,
+    parse_date,
+    parse_dates,
 )
 
 
@@ -38,3 +40,26 @@ def test_get_cleaned_and_standardized_dataframe():
         columns=["aaa_bbb_ccc", "ddd_eee_fff"],
     )
     assert get_cleaned_and_standardized_dataframe(test_df).equals(expected_df)
+
+
+def test_parse_dates():
+    dates = pd.Series(["1970-1-2", "2000-2-29", "1900-5", "unknown", None])
+    expected = dates.map(parse_date)
+    assert parse_dates(dates).equals(expected)
+
+
+def test_get_cleaned_and_standardized_dataframe_whitespaces():
+    values = pd.Series([" a　　b\xa0", "a\x0b\x0bc\t\n", "  a ", None])
+    df = get_cleaned_and_standardized_dataframe(pd.DataFrame({"col:a": values}))
+    assert df["a"].equals(values.map(clean_if_string))
+
+
+def test_get_cleaned_and_standardized_dataframe_object_columns():
+    strings = pd.Series([" a　　b\xa0", "a\x0b\x0bc\t\n", "  a ", None], dtype=object)
+    mixed = pd.Series([" a  b ", 1, None, "c"], dtype=object)
+    df = get_cleaned_and_standardized_dataframe(
+        pd.DataFrame({"strings": strings, "mixed": mixed})
+    )
+    assert df["strings"].tolist()[:3] == strings.map(clean_if_string).tolist()[:3]
+    assert df["strings"].isna().tolist() == [False, False, False, True]
+    assert df["mixed"].tolist() == ["a b", 1, None, "c"]